@@ -1,15 +1,33 @@
+import hashlib
 import json
 import html
+import io
+import itertools
+import math
 import os
 import random
+import re
+import string
+import zlib
+from urllib.parse import quote
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson  # optional, faster: py -m pip install orjson
+except ImportError:
+    orjson = None
+
 
 ROOT = Path(__file__).parent
 JSON_PATH = ROOT / "deals_today.json"
 DOCS_DIR = ROOT / "docs"
 OUTPUT_PATH = DOCS_DIR / "index.html"
+# Digest of the last build's inputs; delete the folder to force a rebuild
+BUILD_CACHE_PATH = ROOT / ".build-cache" / "deals.key"
+STYLESHEET_PATH = DOCS_DIR / "styles.css"
 
 # Beehiiv IDs — from beehiiv Settings / Subscribe forms.
 # Prefer env / sibling snack-buddy .env so IDs aren't hardcoded.
@@ -40,86 +58,144 @@ BEEHIIV_PUBLICATION_ID = _load_env_value("BEEHIIV_PUBLICATION_ID", "BEEHIIV_PUB_
 # Official v3 subscribe form (Audience → Subscribe forms → Get embed code)
 BEEHIIV_FORM_ID = _load_env_value("BEEHIIV_FORM_ID") or "fe019cbd-c068-4f4a-a458-757e07b5460a"
 
-def load_deals():
+# Trailing parenthetical, e.g. "(8ct)" or "(Family Size)"
+_PACK_RE = re.compile(r'\s*\([^)]+\)\s*$')
+# Trailing pack-size parenthetical only, e.g. "(1ct)", "(12 pack)"
+_PACK_SIZE_RE = re.compile(r'\s*\([^)]*(?:ct|pack|count|pk)[^)]*\)\s*$', re.IGNORECASE)
+
+# Common product type keywords that typically come before flavor.
+# Longest first so "protein bar" wins over "bar".
+_PRODUCT_TYPES = tuple(sorted(
+    (
+        "protein bar", "protein chips", "energy drink", "bar", "chips",
+        "cookies", "crackers", "drink", "beverage", "snack",
+    ),
+    key=len,
+    reverse=True,
+))
+
+def read_deals_bytes() -> bytes:
     if not JSON_PATH.exists():
         raise SystemExit(f"JSON deals file not found: {JSON_PATH}")
-    with JSON_PATH.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return JSON_PATH.read_bytes()
+
+
+def load_deals(raw=None):
+    if raw is None:
+        raw = read_deals_bytes()
+    if orjson is not None:
+        try:
+            deals = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN/Infinity, which build_deals_json_from_csv.py
+            # can write for blank prices; the stdlib parser accepts them
+            deals = json.loads(raw)
+    else:
+        deals = json.loads(raw)
+    coerce_deal_numbers(deals)
+    return deals
+
+
+def _to_float(val):
+    if val is None:
+        return None
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(val):
+    if val is None:
+        return None
+    try:
+        return int(val)
+    except (TypeError, ValueError):
+        return None
+
+
+def coerce_deal_numbers(deals) -> None:
+    """Cast numeric fields once at load so renderers can use them directly."""
+    for d in deals:
+        d["new_price"] = _to_float(d.get("new_price"))
+        d["old_price"] = _to_float(d.get("old_price"))
+        d["percent_off"] = _to_float(d.get("percent_off")) or 0.0
+        d["pack_count"] = _to_int(d.get("pack_count"))
 
 
 def parse_verified_at(deal):
-    ts = deal.get("verified_at") or ""
+    ts = deal.get("verified_at")
+    if not ts:
+        return None
     try:
+        if ts.endswith("Z"):
+            ts = ts[:-1] + "+00:00"
         # Most likely ISO 8601
-        return datetime.fromisoformat(ts.replace("Z", "+00:00"))
-    except Exception:
+        return datetime.fromisoformat(ts)
+    except (AttributeError, ValueError):
         return None
 
 
 def get_last_updated_text(deals):
     # Use the newest verified_at if available; otherwise now()
-    times = [t for t in (parse_verified_at(d) for d in deals) if t is not None]
-    if times:
-        latest = max(times)
-    else:
-        latest = datetime.now()
+    latest = max(
+        (t for t in map(parse_verified_at, deals) if t is not None),
+        default=None,
+    ) or datetime.now()
 
     # Example: December 07, 2025 at 11:20 AM
     return latest.strftime("%B %d, %Y at %I:%M %p")
 
 
-def retailer_classes(retailer: str):
-    """
-    Returns (pill_class, button_class) based on retailer.
-    """
-    r = (retailer or "").lower()
-    if "walmart" in r:
-        return "retailer-pill retailer-walmart", "view-button view-walmart"
-    if "kroger" in r:
-        return "retailer-pill retailer-kroger", "view-button view-kroger"
-    if "target" in r:
-        return "retailer-pill retailer-target", "view-button view-target"
-    if "meijer" in r:
-        return "retailer-pill retailer-meijer", "view-button view-meijer"
+# Canonical retailer value -> (pill_class, button_class)
+_RETAILER_CLASSES = {
+    "walmart": ("retailer-pill retailer-walmart", "view-button view-walmart"),
+    "kroger": ("retailer-pill retailer-kroger", "view-button view-kroger"),
+    "target": ("retailer-pill retailer-target", "view-button view-target"),
+    "meijer": ("retailer-pill retailer-meijer", "view-button view-meijer"),
+    "harris teeter": ("retailer-pill retailer-harris-teeter", "view-button view-harris-teeter"),
+}
+_GENERIC_RETAILER_CLASSES = ("retailer-pill retailer-generic", "view-button view-generic")
+
+
+def _retailer_key(r: str) -> str:
+    """Canonical retailer value for a lowercased name, or "" if unknown."""
+    if r in _RETAILER_CLASSES:
+        # Feeds normally carry the plain name ("Walmart"), so this is the common path
+        return r
+    for key in ("walmart", "kroger", "target", "meijer"):
+        if key in r:
+            return key
     if "harris" in r and "teeter" in r:
-        return "retailer-pill retailer-harris-teeter", "view-button view-harris-teeter"
-    return "retailer-pill retailer-generic", "view-button view-generic"
+        return "harris teeter"
+    return ""
 
 
-def retailer_cta_label(retailer: str) -> str:
-    """Site CTA label for 'View on {label}.com' buttons."""
-    r = (retailer or "").lower()
-    if "harris" in r and "teeter" in r:
+def retailer_cta_label_from_lower(r_lower: str, retailer: str) -> str:
+    """Site CTA label for 'View on {label}.com' buttons, given the lowercased name."""
+    if "harris" in r_lower and "teeter" in r_lower:
         return "HarrisTeeter"
     return (retailer or "Retailer").strip()
 
 
-def normalize_retailer_value(raw: str) -> str:
-    r = (raw or "").strip().lower()
-    if "walmart" in r:
-        return "walmart"
-    if "kroger" in r:
-        return "kroger"
-    if "target" in r:
-        return "target"
-    if "meijer" in r:
-        return "meijer"
-    if "harris" in r and "teeter" in r:
-        return "harris teeter"
-    return r  # fallback
+def normalize_retailer_value_from_lower(r_lower: str) -> str:
+    """Filter value for an already stripped, lowercased retailer name."""
+    return _retailer_key(r_lower) or r_lower  # fallback
+
+# Feed availability value -> (label, css class)
+_AVAILABILITY = {
+    "in_store": ("In-store", "availability in-store"),
+    "both": ("In-store & online", "availability both"),
+    "online_only": ("Online only", "availability online-only"),
+}
+_AVAILABILITY_CHECK = ("Check store availability", "availability check")
+
 
 def normalise_availability(raw):
     if not isinstance(raw, str):
-        return "Check store availability", "availability check"
-    val = raw.strip().lower()
-    if val == "in_store":
-        return "In-store", "availability in-store"
-    if val == "both":
-        return "In-store & online", "availability both"
-    if val == "online_only":
-        return "Online only", "availability online-only"
+        return _AVAILABILITY_CHECK
     # Unknown / blank / other → generic helpful message
-    return "Check store availability", "availability check"
+    return _AVAILABILITY.get(raw.strip().lower(), _AVAILABILITY_CHECK)
 
 
 def _norm_str(val) -> str:
@@ -127,16 +203,25 @@ def _norm_str(val) -> str:
     return (val or "").strip()
 
 
+@lru_cache(maxsize=2048)
+def _esc(val: str) -> str:
+    """html.escape for low-cardinality strings (retailer, category, flavor, ...)."""
+    return html.escape(val or "")
+
+
 def _norm_float_key(val):
     """Normalize numeric values for grouping keys (so 1.9 and 1.90 group together)."""
+    if val is None:
+        return None
+    if isinstance(val, (int, float)):
+        return round(float(val), 4)
     try:
-        if val is None:
-            return None
         return round(float(val), 4)
-    except Exception:
+    except (TypeError, ValueError):
         return None
 
 
+@lru_cache(maxsize=4096)
 def extract_flavor_from_product_name(product_name: str) -> str:
     """
     Extract flavor from product name.
@@ -149,21 +234,14 @@ def extract_flavor_from_product_name(product_name: str) -> str:
     if not product_name:
         return ""
     
-    import re
     # Remove pack size in parentheses at the end
-    name_part = re.sub(r'\s*\([^)]+\)\s*$', '', product_name).strip()
-    
-    # Common product type keywords that typically come before flavor
-    product_types = [
-        "protein bar", "protein chips", "energy drink", "bar", "chips",
-        "cookies", "crackers", "drink", "beverage", "snack"
-    ]
+    name_part = _PACK_RE.sub('', product_name).strip()
     
     # Try to find product type and extract flavor after it
     name_lower = name_part.lower()
-    for ptype in sorted(product_types, key=len, reverse=True):  # Try longer matches first
-        if ptype in name_lower:
-            idx = name_lower.find(ptype)
+    for ptype in _PRODUCT_TYPES:  # Longer matches first
+        idx = name_lower.find(ptype)
+        if idx != -1:
             # Get everything after the product type
             flavor_part = name_part[idx + len(ptype):].strip()
             if flavor_part:
@@ -179,6 +257,7 @@ def extract_flavor_from_product_name(product_name: str) -> str:
     return name_part
 
 
+@lru_cache(maxsize=4096)
 def extract_brand_from_product_name(product_name: str) -> str:
     """
     Extract brand from product name (usually first word or two).
@@ -193,6 +272,7 @@ def extract_brand_from_product_name(product_name: str) -> str:
     return ""
 
 
+@lru_cache(maxsize=4096)
 def extract_base_product_name(product_name: str) -> str:
     """
     Extract base product name without flavor and pack size.
@@ -202,21 +282,14 @@ def extract_base_product_name(product_name: str) -> str:
     if not product_name:
         return ""
     
-    import re
     # Remove pack size in parentheses
-    name_part = re.sub(r'\s*\([^)]+\)\s*$', '', product_name).strip()
-    
-    # Common product type keywords
-    product_types = [
-        "protein bar", "protein chips", "energy drink", "bar", "chips",
-        "cookies", "crackers", "drink", "beverage", "snack"
-    ]
+    name_part = _PACK_RE.sub('', product_name).strip()
     
     # Try to find product type and extract base name up to that point
     name_lower = name_part.lower()
-    for ptype in sorted(product_types, key=len, reverse=True):
-        if ptype in name_lower:
-            idx = name_lower.find(ptype)
+    for ptype in _PRODUCT_TYPES:
+        idx = name_lower.find(ptype)
+        if idx != -1:
             # Get everything up to and including the product type
             base_part = name_part[:idx + len(ptype)].strip()
             if base_part:
@@ -229,6 +302,7 @@ def extract_base_product_name(product_name: str) -> str:
     return name_part
 
 
+@lru_cache(maxsize=4096)
 def remove_pack_size_from_name(product_name: str) -> str:
     """
     Remove pack size indicators like (1ct), (8ct), etc. from product name.
@@ -238,10 +312,8 @@ def remove_pack_size_from_name(product_name: str) -> str:
     if not product_name:
         return ""
     
-    import re
     # Remove pack size in parentheses at the end (e.g., (1ct), (8ct), (12 pack), etc.)
-    cleaned = re.sub(r'\s*\([^)]*(?:ct|pack|count|pk)[^)]*\)\s*$', '', product_name, flags=re.IGNORECASE).strip()
-    return cleaned
+    return _PACK_SIZE_RE.sub('', product_name).strip()
 
 
 def group_deals(rows: list[dict]) -> list[dict]:
@@ -257,7 +329,8 @@ def group_deals(rows: list[dict]) -> list[dict]:
     Flavors that share this key are stacked into one group. Each flavor stores
     its name and retailer_url for clickable links.
 
-    Returns grouped deals with flavor_data containing {name, url, image_url} per flavor.
+    Returns grouped deals with flavor_data containing {name, url, image_url} per flavor,
+    plus a precomputed "_sortkey" tuple for the page order.
     """
     groups: dict[tuple, dict] = {}
 
@@ -269,33 +342,27 @@ def group_deals(rows: list[dict]) -> list[dict]:
         brand = _norm_str(row.get("brand")) or extract_brand_from_product_name(product_name)
         pack_count = row.get("pack_count")
         pack_unit = _norm_str(row.get("pack_unit"))
-        pack_size = f"{pack_count}{pack_unit}" if pack_count and pack_unit else ""
-        
-        # Use old_price as baseline, new_price as price
-        price_raw = row.get("new_price")
-        baseline_raw = row.get("old_price")
-        
-        price_key = _norm_float_key(price_raw)
-        baseline_key = _norm_float_key(baseline_raw)
-        
-        # Use product_name directly (it's now the base name without flavor from CSV)
-        base_product = product_name
-        
+        # Lowercased once here; only the key needs the folded form
+        pack_size_key = f"{pack_count}{pack_unit}".lower() if pack_count and pack_unit else ""
+
+        # Use old_price as baseline, new_price as price.
+        # product_name is already the base name without flavor (from CSV).
         key = (
             retailer.lower(),
             section.lower(),
             brand.lower(),
-            base_product.lower(),
-            pack_size.lower(),
-            price_key,
-            baseline_key,
+            product_name.lower(),
+            pack_size_key,
+            _norm_float_key(row.get("new_price")),
+            _norm_float_key(row.get("old_price")),
         )
 
         if key not in groups:
             # Start a new group using a shallow copy of the row
             g = dict(row)
             g["brand"] = brand
-            g["flavor_data"] = []  # List of {name, url, image_url} dicts
+            # Lowercased flavor name -> {name, url, image_url}; becomes flavor_data
+            g["_flavors"] = {}
             g["group_size"] = 0
             groups[key] = g
 
@@ -306,27 +373,39 @@ def group_deals(rows: list[dict]) -> list[dict]:
         retailer_url = _norm_str(row.get("retailer_url") or row.get("canonical_url") or "")
         
         # Check if this flavor already exists in the group (shouldn't happen, but handle it)
-        existing_flavor = next((f for f in g["flavor_data"] if f["name"].lower() == flavor_name.lower()), None)
-        if not existing_flavor and flavor_name and retailer_url:
-            g["flavor_data"].append({
+        flavor_key = flavor_name.lower()
+        flavors = g["_flavors"]
+        if flavor_key and retailer_url and flavor_key not in flavors:
+            flavors[flavor_key] = {
                 "name": flavor_name,
                 "url": retailer_url,
                 "image_url": _norm_str(row.get("image_url") or ""),
-            })
-            g["group_size"] = len(g["flavor_data"])
+            }
+            g["group_size"] = len(flavors)
 
     # Flavor images are shown in per-card carousel; no separate text expand list
     for g in groups.values():
-        flavors = g.get("flavor_data") or []
-        if flavors:
-            flavors.sort(key=lambda x: x["name"].lower())
+        flavors = g.pop("_flavors")
+        # Keys are already lowercased, so this is a plain string sort
+        g["flavor_data"] = [flavors[k] for k in sorted(flavors)]
         g["flavor_sample"] = []
         g["flavor_extra_count"] = 0
         g["flavor_extra_data"] = []
+        # Page order: higher tier first, then best percent off, then cheapest
+        percent = g.get("percent_off") or 0.0
+        g["_sortkey"] = (
+            -_TIER_PRIORITY[get_tier_name(percent)],
+            -percent,
+            g.get("new_price") or 0.0,
+        )
 
     return list(groups.values())
 
 
+# Tier priority for page order: diamond (4) > fire (3) > strong (2) > sale (1)
+_TIER_PRIORITY = {"diamond": 4, "fire": 3, "strong": 2, "sale": 1}
+
+
 def get_tier_name(percent_off):
     """
     Get tier name from percent_off for filtering.
@@ -360,11 +439,19 @@ SPARKLE_STAR_PATH = (
 )
 
 
-def sparkle_star_svg() -> str:
-    return (
-        f'<svg class="sparkle-svg" viewBox="0 0 100 100" aria-hidden="true" focusable="false">'
-        f'<path class="sparkle-shape" d="{SPARKLE_STAR_PATH}"/></svg>'
+def sparkle_star_data_uri() -> str:
+    """
+    The sparkle star as a data: URI for CSS, so the stylesheet carries one copy
+    instead of every card repeating an inline <svg> per sparkle. The viewBox is
+    padded 16 units per side so the mitred stroke tips aren't clipped; the
+    .sparkle::before box is enlarged by the same 16%.
+    """
+    svg = (
+        "<svg xmlns='http://www.w3.org/2000/svg' viewBox='-16 -16 132 132'>"
+        f"<path d='{SPARKLE_STAR_PATH}' fill='#ffffff' stroke='#1e40af' stroke-width='4' "
+        "stroke-linejoin='miter' stroke-miterlimit='8' paint-order='stroke fill'/></svg>"
     )
+    return "data:image/svg+xml," + quote(svg, safe=" '=:/-.,")
 
 
 def fire_pill_flames_svg() -> str:
@@ -398,7 +485,7 @@ def build_diamond_sparkles_html(seed_key: str) -> str:
         """Square canvas keeps the sparkle SVG symmetric."""
         return base, base
 
-    stars = []
+    stars = ['<div class="diamond-sparkles" aria-hidden="true">']
     for _ in range(count):
         width, height = sparkle_size(rng.randint(12, 26))
 
@@ -423,14 +510,11 @@ def build_diamond_sparkles_html(seed_key: str) -> str:
             f"--sparkle-peak:{peak:.2f};"
         )
         stars.append(
-            f'<span class="sparkle" style="{style}">{sparkle_star_svg()}</span>'
+            f'<span class="sparkle" style="{style}"></span>'
         )
 
-    body = "\n            ".join(stars)
-    return f"""
-        <div class="diamond-sparkles" aria-hidden="true">
-            {body}
-        </div>"""
+    stars.append("</div>\n")
+    return "".join(stars)
 
 
 def get_badge(deal):
@@ -442,10 +526,12 @@ def get_badge(deal):
     - 10–19.99% → 💪 Strong (badge-protein)
     - 0–9.99% → 🏷️ On Sale (badge-everyday)
     """
-    try:
-        percent_off = float(deal.get("percent_off", 0.0))
-    except Exception:
-        percent_off = 0.0
+    percent_off = deal.get("percent_off") or 0.0
+    if not isinstance(percent_off, (int, float)):
+        try:
+            percent_off = float(percent_off)
+        except (TypeError, ValueError):
+            percent_off = 0.0
 
     # Check for Diamond tier (≥25%)
     if percent_off >= 25.0:
@@ -503,84 +589,187 @@ def get_card_image_items(deal) -> list[dict]:
     return items
 
 
-def build_card_image_carousel_html(deal, default_alt: str) -> str:
-    items = get_card_image_items(deal)
+_CAROUSEL_ARROWS_HTML = (
+    '<button type="button" class="card-carousel-prev" aria-label="Previous flavor">&#8249;</button>\n'
+    '<button type="button" class="card-carousel-next" aria-label="Next flavor">&#8250;</button>\n'
+)
+
+# Carousels with this many slides or more ship only the three a visitor can
+# see at index 0 (active, previous, next) as markup. The ones in between are
+# invisible until the carousel is stepped, so their data goes in the inline
+# page data instead and the script builds them when it wires the carousel.
+CAROUSEL_DEFERRED_MIN = 4
+
+
+def deferred_carousel_slides(items, default_alt: str) -> list[list[str]]:
+    """
+    [url, image_url, flavor name, alt] for each of a card's carousel *items*
+    (from get_card_image_items) that build_card_image_carousel_html leaves out.
+    """
+    if len(items) < CAROUSEL_DEFERRED_MIN:
+        return []
+    return [
+        [item["url"] or "#", item["image_url"], item["name"], item["name"] or default_alt]
+        for item in items[2:-1]
+    ]
+
+
+# Largest box .card-image is drawn in (max-height 110px, slide max-width
+# 200px). Emitted as width/height so each image's box is fixed before it
+# loads; object-fit: contain keeps the product's own aspect inside it.
+CARD_IMAGE_WIDTH = 200
+CARD_IMAGE_HEIGHT = 110
+
+
+def build_card_image_carousel_html(deal, default_alt: str, items=None) -> str:
+    if items is None:
+        items = get_card_image_items(deal)
     if not items:
         return '<div class="card-carousel card-carousel--empty"></div>'
 
+    n = len(items)
+    deferred = n >= CAROUSEL_DEFERRED_MIN
     slides = []
     for i, item in enumerate(items):
+        if deferred and 1 < i < n - 1:
+            # Off-screen slide; the script builds it from __SB_SLIDES
+            continue
         img_url = html.escape(item["image_url"])
-        alt = html.escape(item["name"] or default_alt)
+        alt = _esc(item["name"] or default_alt)
         url = html.escape(item["url"] or "#")
-        flavor_name = html.escape(item["name"])
+        flavor_name = _esc(item["name"])
+        # Same classes the script's render() gives slide i at index 0, so a
+        # carousel looks right before (or without) its script being wired up.
+        if i == 0:
+            state = "is-active"
+        elif i == n - 1:
+            state = "is-prev"
+        elif i == 1:
+            state = "is-next"
+        else:
+            state = "is-hidden"
         slides.append(
-            f'<div class="card-carousel-slide" data-index="{i}" data-flavor-name="{flavor_name}">'
+            f'<div class="card-carousel-slide {state}" data-index="{i}" data-flavor-name="{flavor_name}">'
             f'<a href="{url}" target="_blank" rel="noopener noreferrer" class="card-carousel-link">'
-            f'<img src="{img_url}" alt="{alt}" class="card-image" loading="lazy"/>'
+            f'<img src="{img_url}" alt="{alt}" class="card-image" width="{CARD_IMAGE_WIDTH}" '
+            f'height="{CARD_IMAGE_HEIGHT}" loading="lazy" decoding="async"/>'
             f"</a></div>"
         )
 
-    multi = len(items) > 1
+    multi = n > 1
     arrows_html = ""
     if multi:
-        arrows_html = """
-            <button type="button" class="card-carousel-prev" aria-label="Previous flavor">&#8249;</button>
-            <button type="button" class="card-carousel-next" aria-label="Next flavor">&#8250;</button>
-        """
+        arrows_html = _CAROUSEL_ARROWS_HTML
 
-    first_caption = html.escape(items[0]["name"]) if items[0].get("name") else ""
+    first_caption = _esc(items[0]["name"]) if items[0].get("name") else ""
     caption_html = ""
     if first_caption:
         caption_html = f'<div class="card-carousel-caption">{first_caption}</div>'
 
     single_class = "" if multi else " card-carousel--single"
+    deferred_attr = " data-deferred-slides" if deferred else ""
 
-    return f"""
-        <div class="card-carousel{single_class}" data-slide-count="{len(items)}">
-            <div class="card-carousel-stage">
-                {"".join(slides)}
-            </div>
-            {arrows_html}
-            {caption_html}
-        </div>
+    parts = [
+        f'<div class="card-carousel{single_class}" data-slide-count="{n}"{deferred_attr}>\n',
+        '<div class="card-carousel-stage">',
+    ]
+    parts.extend(slides)
+    parts.append("</div>\n")
+    if arrows_html:
+        parts.append(arrows_html)
+    if caption_html:
+        parts.append(caption_html)
+        parts.append("\n")
+    parts.append("</div>\n")
+    return "".join(parts)
+
+
+# DOM handles for per-card elements (flavor lists); only need to be unique per page
+_card_seq = itertools.count()
+
+# Card data-* attributes the client-side filter bar works on, in card_filter_values order
+FILTER_KEYS = ("section", "category", "retailer", "brand")
+
+
+def retailer_lower(deal) -> str:
+    """The deal's retailer name, stripped and lowercased (the *_from_lower helpers' input)."""
+    return (deal.get("retailer") or "").strip().lower()
+
+
+def card_filter_values(deal, retailer_l=None):
     """
+    Returns the normalized (section, category, retailer, brand) filter values
+    written to a card's data-* attributes. *retailer_l* is retailer_lower(deal)
+    when the caller already has it.
+    """
+    if retailer_l is None:
+        retailer_l = retailer_lower(deal)
+    brand = _norm_str(deal.get("brand")) or extract_brand_from_product_name(
+        deal.get("product_name", "")
+    )
+    return (
+        (deal.get("section") or "").strip().lower(),
+        (deal.get("category") or "").strip().lower(),
+        normalize_retailer_value_from_lower(retailer_l),
+        brand.lower(),
+    )
 
 
-def build_card_html(deal):
+def build_card_html(
+    deal,
+    filter_values=None,
+    filter_codes=None,
+    image_items=None,
+    product_name_cleaned=None,
+    retailer_l=None,
+):
     # Use product_name directly from the deal (from CSV, not combined)
-    # Remove pack size indicators since we have a pack pill overlay
-    product_name = deal.get("product_name", "")
-    product_name_cleaned = remove_pack_size_from_name(product_name)
+    # Remove pack size indicators since we have a pack pill overlay. write_page
+    # passes the cleaned name and carousel items in, as it also needs them
+    # for the __SB_SLIDES payload.
+    if product_name_cleaned is None:
+        product_name_cleaned = remove_pack_size_from_name(deal.get("product_name", ""))
     name = html.escape(product_name_cleaned)
-    retailer = html.escape(deal.get("retailer", ""))
-    category = html.escape(deal.get("category", ""))
+    category = _esc(deal.get("category") or "")
     old_price = deal.get("old_price")
-    new_price = deal.get("new_price")
-    percent_off = float(deal.get("percent_off", 0.0))
+    new_price_val = deal.get("new_price") or 0.0
+    percent_off = deal.get("percent_off") or 0.0
     retailer_url = html.escape(deal.get("retailer_url", "#"))
-    image_carousel_html = build_card_image_carousel_html(deal, product_name_cleaned)
+    image_carousel_html = build_card_image_carousel_html(deal, product_name_cleaned, image_items)
     
     # Get the number of flavors/deals in this group (default to 1 if no flavor_data)
     flavor_data = deal.get("flavor_data", [])
     deal_count = len(flavor_data) if flavor_data else 1
     
-    flavor_extra_count = deal.get("flavor_extra_count", 0)
-    flavor_extra_data = deal.get("flavor_extra_data", [])
+    flavor_extra_data = deal.get("flavor_extra_data") or []
 
-    # Normalized values for filters (used in data-* attributes)
-    section_raw = (deal.get("section") or "").strip().lower()
-    category_raw = (deal.get("category") or "").strip().lower()
-    retailer_raw = normalize_retailer_value(deal.get("retailer") or "")
-    brand_raw = (_norm_str(deal.get("brand")) or extract_brand_from_product_name(product_name)).lower()
+    # The retailer is lowercased once per card (write_page passes it in) and
+    # feeds both the filter value and the CTA label
+    if retailer_l is None:
+        retailer_l = retailer_lower(deal)
 
-    section_attr = html.escape(section_raw)
-    category_attr = html.escape(category_raw)
-    retailer_attr = html.escape(retailer_raw)
-    brand_attr = html.escape(brand_raw)
+    # Normalized values for filters (used in data-* attributes); write_page
+    # passes them in since it already computed them for the filter CSS
+    section_raw, category_raw, retailer_raw, brand_raw = (
+        filter_values or card_filter_values(deal, retailer_l)
+    )
+    # The retailer is classified once (by card_filter_values); reused for the button class
+    retailer_name = deal.get("retailer") or ""
+    retailer_key = retailer_raw if retailer_raw in _RETAILER_CLASSES else ""
+
+    # On the page the attributes carry each value's index into the shared
+    # __SB_FACETS lists rather than repeating the string on every card
+    if filter_codes:
+        section_attr, category_attr, retailer_attr, brand_attr = filter_codes
+    else:
+        section_attr = _esc(section_raw)
+        category_attr = _esc(category_raw)
+        retailer_attr = _esc(retailer_raw)
+        brand_attr = _esc(brand_raw)
 
     # Retailer specific styling
-    pill_class, button_class = retailer_classes(deal.get("retailer", ""))
+    button_class = _RETAILER_CLASSES.get(retailer_key, _GENERIC_RETAILER_CLASSES)[1]
+    cta_label = retailer_cta_label_from_lower(retailer_l, retailer_name)
 
     # Availability
     availability_text, availability_class = normalise_availability(
@@ -601,72 +790,48 @@ def build_card_html(deal):
     pack_count = deal.get("pack_count")
     pack_unit = deal.get("pack_unit")
     pack_pill_html = ""
-    try:
-        if pack_count is not None and pack_unit:
-            pack_pill_html = (
-                f"<div class='pack-pill'>"
-                f"<span class='pack-count'>{int(pack_count)}</span> "
-                f"<span class='pack-unit'>{html.escape(pack_unit)}</span>"
-                f"</div>"
-            )
-    except Exception:
-        pack_pill_html = ""
-
-    # Make sure pricing can be cast safely
-    try:
-        new_price_val = float(new_price) if new_price is not None else 0.0
-    except Exception:
-        new_price_val = 0.0
+    if pack_count is not None and pack_unit:
+        pack_pill_html = (
+            f"<div class='pack-pill'>"
+            f"<span class='pack-count'>{pack_count}</span> "
+            f"<span class='pack-unit'>{_esc(pack_unit)}</span>"
+            f"</div>\n"
+        )
 
+    # Prices were cast to float (or None) by coerce_deal_numbers
     old_price_html = ""
-    if old_price is not None:
-        try:
-            old_price_val = float(old_price)
-            if old_price_val > new_price_val:
-                old_price_html = (
-                    f"<span class='old-price'>${old_price_val:.2f}</span>"
-                )
-        except Exception:
-            old_price_html = ""
+    if old_price is not None and old_price > new_price_val:
+        old_price_html = f"<span class='old-price'>${old_price:.2f}</span>\n"
 
     availability_html = ""
     if availability_text:
-        availability_html = f"<div class='{availability_class}'>{availability_text}</div>"
+        availability_html = f"<div class='{availability_class}'>{availability_text}</div>\n"
 
     streak_html = ""
     if streak_text:
-        streak_html = f"<div class='streak'>{streak_text}</div>"
+        streak_html = f"<div class='streak'>{streak_text}</div>\n"
 
     badge_html = ""
     if badge_label and badge_class:
         if tier_name == "fire":
-            import hashlib
             flicker_seed = f"{retailer_raw}|{name}|{new_price_val}"
-            flicker_delay = (
-                int(hashlib.md5(flicker_seed.encode()).hexdigest()[:4], 16) % 75
-            ) / 10.0
+            flicker_delay = (zlib.crc32(flicker_seed.encode()) % 75) / 10.0
             badge_html = (
                 f"<div class='{badge_class} badge-fire-pill'>"
                 f"<span class='fire-pill-flames' style='animation-delay:{flicker_delay:.1f}s' "
                 f"aria-hidden='true'>{fire_pill_flames_svg()}</span>"
-                f"<span class='fire-pill-label'>🔥 Fire</span></div>"
+                f"<span class='fire-pill-label'>🔥 Fire</span></div>\n"
             )
         else:
-            badge_html = f"<div class='{badge_class}'>{badge_label}</div>"
+            badge_html = f"<div class='{badge_class}'>{badge_label}</div>\n"
 
     diamond_sparkles_html = ""
     diamond_style_attr = ""
     if tier_name == "diamond":
-        import hashlib
         sparkle_seed = f"{retailer_raw}|{name}|{new_price_val}|{deal_count}"
         diamond_sparkles_html = build_diamond_sparkles_html(sparkle_seed)
         # Unique sheen phase + duration per card so sweeps rarely align
-        h = int(
-            hashlib.md5(
-                f"{retailer_raw}|{name}|{new_price_val}|{deal_count}|sheen".encode()
-            ).hexdigest()[:8],
-            16,
-        )
+        h = zlib.crc32(f"{sparkle_seed}|sheen".encode())
         sheen_duration = 4.4 + (h % 23) / 10.0  # 4.4–6.6s, drift apart over time
         sheen_delay = ((h >> 8) % 1000) / 1000.0 * sheen_duration
         badge_delay = ((h >> 16) % 1000) / 1000.0 * 2.8
@@ -678,119 +843,72 @@ def build_card_html(deal):
 
     category_tag_html = ""
     if category:
-        category_tag_html = f'<div class="card-category-tag">{category}</div>'
+        category_tag_html = f'<div class="card-category-tag">{category}</div>\n'
 
-    # Text list only for flavors beyond the 4 shown as images
+    # Text list only for flavors beyond those shown as images. group_deals
+    # leaves flavor_extra_data empty, so cards normally emit no flavor-info.
     flavor_html = ""
-    if flavor_extra_count > 0:
-        import hashlib
-        card_id = hashlib.md5(f"{retailer}{name}{new_price_val}".encode()).hexdigest()[:8]
-        flavor_html = f"""
-            <div class="flavor-info">
-                <button type="button" class="flavor-expand-link" data-card-id="{card_id}" data-extra-count="{flavor_extra_count}" aria-expanded="false" aria-controls="flavors-{card_id}">
-                    {flavor_extra_count} more flavors
-                </button>
-                <div class="flavor-list-expanded" id="flavors-{card_id}" style="display: none;">
-                    {''.join([f'<a href="{html.escape(f.get("url", "#"))}" target="_blank" rel="noopener noreferrer" class="flavor-link">{html.escape(f.get("name", ""))}</a>' for f in flavor_extra_data])}
-                </div>
-            </div>
-            """
-
-    return f"""
-    <div class="card {tier_class}"{diamond_style_attr}
-         data-section="{section_attr}"
-         data-category="{category_attr}"
-         data-retailer="{retailer_attr}"
-         data-brand="{brand_attr}"
-         data-price="{new_price_val}"
-         data-percent="{float(percent_off) if percent_off is not None else 0.0}"
-         data-deal-count="{deal_count}"
-         data-tier="{tier_name}">
-        {diamond_sparkles_html}
-        <div class="card-image-wrap">
-            {image_carousel_html}
-            {category_tag_html}
-            {pack_pill_html}
-            {badge_html}
-        </div>
-        <div class="card-content">
-            <div class="card-pricing">
-                {old_price_html}
-                <span class="new-price">${new_price_val:.2f}</span>
-                <span class="percent-off">{percent_off:.0f}% OFF</span>
-            </div>
-            <div class="card-title">{name}</div>
-            {flavor_html}
-            <div class="card-footer">
-                {availability_html}
-                {streak_html}
-            </div>
-            <a class="{button_class}" href="{retailer_url}" target="_blank" rel="noopener noreferrer">
-                View on {retailer_cta_label(deal.get("retailer", ""))}.com
-            </a>
-        </div>
-    </div>
-    """
-
+    if flavor_extra_data:
+        flavor_extra_count = len(flavor_extra_data)
+        card_id = f"c{next(_card_seq):x}"
+        flavor_links = "".join(
+            f'<a href="{html.escape(f.get("url", "#"))}" target="_blank" rel="noopener noreferrer" '
+            f'class="flavor-link">{_esc(f.get("name", ""))}</a>'
+            for f in flavor_extra_data
+        )
+        flavor_html = (
+            f'<div class="flavor-info">\n'
+            f'<button type="button" class="flavor-expand-link" data-card-id="{card_id}" '
+            f'data-extra-count="{flavor_extra_count}" aria-expanded="false" aria-controls="flavors-{card_id}">'
+            f"{flavor_extra_count} more flavor{'' if flavor_extra_count == 1 else 's'}</button>\n"
+            f'<div class="flavor-list-expanded" id="flavors-{card_id}" style="display: none;">'
+            f"{flavor_links}</div>\n"
+            f"</div>\n"
+        )
 
-def build_page_html(deals):
-    # Group deals into deal families
-    grouped_deals = group_deals(deals)
-    # Calculate total number of individual deals (flavors) across all groups
-    total_deals = sum(
-        len(g.get("flavor_data", [])) if g.get("flavor_data") else 1
-        for g in grouped_deals
+    # Optional fragments above are "" or end in a newline, so the whole card
+    # is one f-string: Python compiles its literal runs once, at import, and
+    # each call only fills the slots.
+    return (
+        f'<div class="card {tier_class}"{diamond_style_attr}'
+        f' data-section="{section_attr}" data-category="{category_attr}"'
+        f' data-retailer="{retailer_attr}" data-brand="{brand_attr}">\n'
+        f'{diamond_sparkles_html}<div class="card-image-wrap">\n'
+        f"{image_carousel_html}{category_tag_html}{pack_pill_html}{badge_html}"
+        f'</div>\n<div class="card-content">\n<div class="card-pricing">\n'
+        f"{old_price_html}"
+        f'<span class="new-price">${new_price_val:.2f}</span>\n'
+        f'<span class="percent-off">{percent_off:.0f}% OFF</span>\n'
+        f'</div>\n<div class="card-title">{name}</div>\n'
+        f'{flavor_html}<div class="card-footer">\n{availability_html}{streak_html}</div>\n'
+        f'<a class="{button_class}" href="{retailer_url}" target="_blank" rel="noopener noreferrer">'
+        f"View on {cta_label}.com</a>\n"
+        f"</div>\n</div>\n"
     )
-    last_updated = get_last_updated_text(deals)
 
-    # Sort: tier (diamond first, then fire, then strong, then sale) → best savings → price
-    def sort_key(d):
-        percent = float(d.get("percent_off") or 0.0)
-        # Tier priority: diamond (4) > fire (3) > strong (2) > sale (1)
-        if percent >= 25.0:
-            tier_priority = 4
-        elif percent >= 20.0:
-            tier_priority = 3
-        elif percent >= 10.0:
-            tier_priority = 2
-        else:
-            tier_priority = 1
-        return (
-            -tier_priority,  # Higher tier first
-            -percent,  # Then by percent off (best deals first)
-            float(d.get("new_price") or 0.0),
-        )
 
-    deals_sorted = sorted(grouped_deals, key=sort_key)
-    cards_html = "\n".join(build_card_html(d) for d in deals_sorted)
-    beehiiv_form_id = html.escape(BEEHIIV_FORM_ID)
-    beehiiv_pub_id = html.escape(BEEHIIV_PUBLICATION_ID)
-    beehiiv_embed_script = (
-        f'<script async src="https://subscribe-forms.beehiiv.com/v3/loader.js" '
-        f'data-beehiiv-form="{beehiiv_form_id}"></script>'
-        if BEEHIIV_FORM_ID
-        else '<p class="sb-note">Email signup is almost ready.</p>'
-    )
+# Strings are matched first so their contents are never touched
+_CSS_STRING = r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')"""
+_CSS_SPACE_RE = re.compile(_CSS_STRING + r"|(?:\s*/\*.*?\*/)+\s*|\s+", re.S)
+_CSS_PUNCT_RE = re.compile(_CSS_STRING + r"| ?([{};,>]) ?|(:) ")
 
-    return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8" />
-    <title>SnackBuddy Daily Deals</title>
-    <meta name="viewport" content="width=device-width, initial-scale=1" />
-    <link rel="preconnect" href="https://fonts.googleapis.com" />
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin />
-    <link href="https://fonts.googleapis.com/css2?family=Fraunces:opsz,wght@9..144,600;9..144,700&family=Outfit:wght@400;500;600;700&display=swap" rel="stylesheet" />
-    <!-- Google tag (gtag.js) -->
-    <script async src="https://www.googletagmanager.com/gtag/js?id=G-N900K39W95"></script>
-    <script>
-      window.dataLayer = window.dataLayer || [];
-      function gtag(){{dataLayer.push(arguments);}}
-      gtag('js', new Date());
-      gtag('config', 'G-N900K39W95');
-    </script>
-    <style>
-        :root {{
+
+def minify_css(css: str) -> str:
+    """
+    Drop comments and whitespace the CSS grammar doesn't need. Spaces that
+    can matter (descendant combinators, calc() operators, before a
+    pseudo-class colon) are kept.
+    """
+    # A comment counts as whitespace, so it collapses with the space around it
+    css = _CSS_SPACE_RE.sub(lambda m: m.group(1) or " ", css)
+    css = _CSS_PUNCT_RE.sub(lambda m: m.group(1) or m.group(2) or m.group(3), css)
+    return css.replace(";}", "}").strip()
+
+
+# Above-the-fold rules (base, header, filter bar, hero, deal cards) plus the
+# welcome flow, which opens on DOMContentLoaded for first-time visitors. Inlined
+# in <head> so the first screen paints without waiting on the stylesheet.
+CRITICAL_CSS = """        :root {
             --bg: #f3f4f6;
             --card-bg: #ffffff;
             --border-subtle: #e5e7eb;
@@ -805,93 +923,100 @@ def build_page_html(deals):
             --radius-lg: 16px;
             --radius-pill: 999px;
             --navy: #0f172a;
-        }}
+        }
 
-        * {{
+        * {
             box-sizing: border-box;
-        }}
+        }
 
-        body {{
+        body {
             margin: 0;
             font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI",
                 sans-serif;
             background-color: var(--bg);
             color: var(--text-main);
-        }}
+        }
 
-        .page {{
+        .page {
             max-width: 1100px;
             margin: 0 auto 40px auto;
             padding: 0 16px 40px 16px;
-        }}
+        }
+
+        @media (max-width: 640px) {
+            .page {
+                padding-top: 8px;
+            }
+        }
 
         /* ============================ */
         /* SECTION 1A: SITE HEADER NAV  */
         /* ============================ */
 
-        .sb-header {{
+        .sb-header {
             position: sticky;
             top: 0;
             z-index: 40;
             background-color: #ffffff;
             border-bottom: 1px solid var(--border-subtle);
-        }}
+        }
 
-        .sb-header-inner {{
+        .sb-header-inner {
             max-width: 1100px;
             margin: 0 auto;
             padding: 10px 16px;
             display: flex;
             align-items: center;
             justify-content: space-between;
-        }}
+        }
 
-        .sb-header-left {{
+        .sb-header-left {
             display: flex;
             align-items: center;
             gap: 8px;
-        }}
+        }
 
         /* Logo image (replaces placeholder box) */
-        .sb-logo {{
+        .sb-logo {
             width: 32px;
             height: 32px;
             border-radius: 8px;
             object-fit: contain;
             display: block;
-        }}
+        }
 
-        .sb-header-title {{
+        .sb-header-title {
             font-weight: 600;
             font-size: 18px;
             color: var(--text-main);
-        }}
+        }
 
-        .sb-menu-button {{
+        .sb-menu-button {
             border: none;
             background: transparent;
             font-size: 20px;
             cursor: pointer;
-        }}
+        }
 
         /* Slide-out nav drawer */
 
-        .sb-nav-backdrop {{
+        .sb-nav-backdrop {
             position: fixed;
             inset: 0;
             background: rgba(15, 23, 42, 0.35);
             opacity: 0;
             pointer-events: none;
             transition: opacity 0.18s ease-out;
+            will-change: opacity;
             z-index: 39;
-        }}
+        }
 
-        .sb-nav-backdrop.open {{
+        .sb-nav-backdrop.open {
             opacity: 1;
             pointer-events: auto;
-        }}
+        }
 
-        .sb-nav-drawer {{
+        .sb-nav-drawer {
             position: fixed;
             top: 0;
             right: 0;
@@ -901,87 +1026,89 @@ def build_page_html(deals):
             box-shadow: -8px 0 20px rgba(15,23,42,0.25);
             transform: translateX(100%);
             transition: transform 0.2s ease-out;
+            will-change: transform;
             z-index: 40;
             display: flex;
             flex-direction: column;
-        }}
+            contain: strict;
+        }
 
-        .sb-nav-drawer.open {{
+        .sb-nav-drawer.open {
             transform: translateX(0%);
-        }}
+        }
 
-        .sb-nav-inner {{
+        .sb-nav-inner {
             padding: 16px 18px;
             display: flex;
             flex-direction: column;
             gap: 12px;
             height: 100%;
-        }}
+        }
 
-        .sb-nav-header {{
+        .sb-nav-header {
             display: flex;
             align-items: center;
             justify-content: space-between;
             margin-bottom: 8px;
-        }}
+        }
 
-        .sb-nav-header-left {{
+        .sb-nav-header-left {
             display: flex;
             align-items: center;
             gap: 8px;
-        }}
+        }
 
-        .sb-nav-title {{
+        .sb-nav-title {
             font-weight: 600;
             font-size: 18px;
-        }}
+        }
 
-        .sb-nav-close {{
+        .sb-nav-close {
             border: none;
             background: transparent;
             font-size: 20px;
             cursor: pointer;
-        }}
+        }
 
-        .sb-nav-link {{
+        .sb-nav-link {
             display: block;
             padding: 8px 0;
             font-size: 14px;
             color: var(--text-main);
             text-decoration: none;
-        }}
+        }
 
-        .sb-nav-link:hover {{
+        .sb-nav-link:hover {
             color: var(--blue);
-        }}
+        }
 
-        .sb-nav-footer {{
+        .sb-nav-footer {
             margin-top: auto;
             font-size: 12px;
             color: var(--text-muted);
             line-height: 1.35;
-        }}
+        }
 
 /* ============================ */
 /* FILTER BAR (Walmart-style pills) */
 /* ============================ */
 
-.sb-filter-bar-section {{
+.sb-filter-bar-section {
   max-width: 1100px;
   margin: 10px auto 12px;
   padding: 0 8px 0 4px;
   position: relative;
   z-index: 30;
-}}
+}
 
-.sb-filter-bar {{
+.sb-filter-bar {
   display: flex;
   align-items: center;
   gap: 6px;
   min-width: 0;
-}}
+}
 
-.sb-filter-master {{
+.sb-filter-master {
   position: relative;
   flex-shrink: 0;
   display: inline-flex;
@@ -995,21 +1122,21 @@ def build_page_html(deals):
   background: #ffffff;
   cursor: pointer;
   box-shadow: 0 1px 2px rgba(15, 23, 42, 0.06);
-}}
+}
 
-.sb-filter-master:hover {{
+.sb-filter-master:hover {
   filter: brightness(0.98);
-}}
+}
 
-.sb-filter-master-icon {{
+.sb-filter-master-icon {
   width: 20px;
   height: 20px;
   display: block;
   color: #111827;
-}}
+}
 
 .sb-filter-master-badge,
-.sb-filter-pill-badge {{
+.sb-filter-pill-badge {
   position: absolute;
   top: -4px;
   right: -4px;
@@ -1023,14 +1150,14 @@ def build_page_html(deals):
   font-weight: 800;
   line-height: 18px;
   text-align: center;
-}}
+}
 
-.sb-filter-pill-badge {{
+.sb-filter-pill-badge {
   top: -6px;
   right: -6px;
-}}
+}
 
-.sb-filter-scroll-btn {{
+.sb-filter-scroll-btn {
   position: absolute;
   top: 50%;
   transform: translateY(-50%);
@@ -1052,37 +1179,37 @@ def build_page_html(deals):
   justify-content: center;
   box-shadow: 0 1px 3px rgba(15, 23, 42, 0.14);
   opacity: 1;
-}}
+}
 
 .sb-filter-scroll-btn:hover,
-.sb-filter-scroll-btn:focus-visible {{
+.sb-filter-scroll-btn:focus-visible {
   border-color: #94a3b8;
   background: #f8fafc;
-}}
+}
 
-.sb-filter-scroll-btn.is-visible {{
+.sb-filter-scroll-btn.is-visible {
   display: inline-flex;
-}}
+}
 
-.sb-filter-scroll-prev {{
+.sb-filter-scroll-prev {
   left: 2px;
-}}
+}
 
-.sb-filter-scroll-next {{
+.sb-filter-scroll-next {
   right: 2px;
-}}
+}
 
-.sb-filter-bar-scroll {{
+.sb-filter-bar-scroll {
   position: relative;
   flex: 1;
   min-width: 0;
   display: flex;
   align-items: center;
-}}
+}
 
 /* Soft fade instead of hard cut-off when more pills sit off-screen */
 .sb-filter-bar-scroll.has-scroll-prev::before,
-.sb-filter-bar-scroll.has-scroll-next::after {{
+.sb-filter-bar-scroll.has-scroll-next::after {
   content: "";
   position: absolute;
   top: 0;
@@ -1090,36 +1217,36 @@ def build_page_html(deals):
   width: 20px;
   z-index: 2;
   pointer-events: none;
-}}
+}
 
-.sb-filter-bar-scroll.has-scroll-prev::before {{
+.sb-filter-bar-scroll.has-scroll-prev::before {
   left: 0;
   background: linear-gradient(to right, var(--bg) 15%, rgba(243, 244, 246, 0));
-}}
+}
 
-.sb-filter-bar-scroll.has-scroll-next::after {{
+.sb-filter-bar-scroll.has-scroll-next::after {
   right: 0;
   background: linear-gradient(to left, var(--bg) 15%, rgba(243, 244, 246, 0));
-}}
+}
 
-.sb-filter-bar-scroll.has-scroll-prev .sb-filter-bar-track {{
+.sb-filter-bar-scroll.has-scroll-prev .sb-filter-bar-track {
   mask-image: linear-gradient(to right, transparent 0, #000 16px);
   -webkit-mask-image: linear-gradient(to right, transparent 0, #000 16px);
   padding-left: 26px;
-}}
+}
 
-.sb-filter-bar-scroll.has-scroll-next .sb-filter-bar-track {{
+.sb-filter-bar-scroll.has-scroll-next .sb-filter-bar-track {
   mask-image: linear-gradient(to left, transparent 0, #000 16px);
   -webkit-mask-image: linear-gradient(to left, transparent 0, #000 16px);
   padding-right: 26px;
-}}
+}
 
-.sb-filter-bar-scroll.has-scroll-prev.has-scroll-next .sb-filter-bar-track {{
+.sb-filter-bar-scroll.has-scroll-prev.has-scroll-next .sb-filter-bar-track {
   mask-image: linear-gradient(to right, transparent 0, #000 16px, #000 calc(100% - 16px), transparent);
   -webkit-mask-image: linear-gradient(to right, transparent 0, #000 16px, #000 calc(100% - 16px), transparent);
-}}
+}
 
-.sb-filter-bar-track {{
+.sb-filter-bar-track {
   flex: 1;
   min-width: 0;
   overflow-x: auto;
@@ -1127,47 +1254,47 @@ def build_page_html(deals):
   scroll-behavior: smooth;
   -webkit-overflow-scrolling: touch;
   scrollbar-width: none;
-}}
+}
 
-.sb-filter-bar-track::-webkit-scrollbar {{
+.sb-filter-bar-track::-webkit-scrollbar {
   display: none;
-}}
+}
 
-.sb-filter-bar-inner {{
+.sb-filter-bar-inner {
   display: flex;
   flex-wrap: nowrap;
   align-items: center;
   gap: 6px;
   padding: 4px 0;
   min-width: min-content;
-}}
+}
 
-@media (max-width: 640px) {{
-  .sb-filter-bar-section {{
+@media (max-width: 640px) {
+  .sb-filter-bar-section {
     padding: 0 6px 0 2px;
-  }}
+  }
 
-  .sb-filter-bar {{
+  .sb-filter-bar {
     gap: 4px;
-  }}
+  }
 
-  .sb-filter-master {{
+  .sb-filter-master {
     width: 38px;
     height: 38px;
-  }}
+  }
 
-  .sb-filter-pill {{
+  .sb-filter-pill {
     padding: 9px 12px;
     font-size: 13px;
-  }}
-}}
+  }
+}
 
-.sb-filter-pill-wrap {{
+.sb-filter-pill-wrap {
   position: relative;
   flex-shrink: 0;
-}}
+}
 
-.sb-filter-pill {{
+.sb-filter-pill {
   position: relative;
   display: inline-flex;
   align-items: center;
@@ -1183,24 +1310,24 @@ def build_page_html(deals):
   cursor: pointer;
   font-family: inherit;
   line-height: 1.2;
-}}
+}
 
-.sb-filter-pill:hover {{
+.sb-filter-pill:hover {
   background: #f9fafb;
-}}
+}
 
-.sb-filter-pill[aria-expanded="true"] {{
+.sb-filter-pill[aria-expanded="true"] {
   background: #f3f4f6;
   box-shadow: inset 0 0 0 1px #111827;
-}}
+}
 
-.sb-filter-pill-chevron {{
+.sb-filter-pill-chevron {
   font-size: 12px;
   color: #374151;
   line-height: 1;
-}}
+}
 
-.sb-filter-dropdown-panel {{
+.sb-filter-dropdown-panel {
   position: fixed;
   z-index: 46;
   min-width: 220px;
@@ -1212,47 +1339,47 @@ def build_page_html(deals):
   border-radius: 12px;
   background: #ffffff;
   box-shadow: 0 10px 28px rgba(15, 23, 42, 0.14);
-}}
+}
 
-.sb-filter-dropdown-panel[hidden] {{
+.sb-filter-dropdown-panel[hidden] {
   display: none !important;
-}}
+}
 
-.sb-filter-dropdown-empty {{
+.sb-filter-dropdown-empty {
   padding: 8px 4px;
   font-size: 13px;
   color: var(--text-muted);
   line-height: 1.4;
-}}
+}
 
-.sb-filter-check {{
+.sb-filter-check {
   display: flex;
   align-items: center;
   gap: 10px;
   padding: 6px 4px;
   font-size: 14px;
   cursor: pointer;
-}}
+}
 
-.sb-filter-check input {{
+.sb-filter-check input {
   width: 16px;
   height: 16px;
   flex-shrink: 0;
-}}
+}
 
-.sb-filter-dropdown-backdrop {{
+.sb-filter-dropdown-backdrop {
   position: fixed;
   inset: 0;
   z-index: 44;
   background: transparent;
   display: none;
-}}
+}
 
-.sb-filter-dropdown-backdrop.open {{
+.sb-filter-dropdown-backdrop.open {
   display: block;
-}}
+}
 
-.sb-filter-sheet-backdrop {{
+.sb-filter-sheet-backdrop {
   position: fixed;
   inset: 0;
   z-index: 48;
@@ -1260,14 +1387,15 @@ def build_page_html(deals):
   opacity: 0;
   pointer-events: none;
   transition: opacity 0.18s ease-out;
-}}
+  will-change: opacity;
+}
 
-.sb-filter-sheet-backdrop.open {{
+.sb-filter-sheet-backdrop.open {
   opacity: 1;
   pointer-events: auto;
-}}
+}
 
-.sb-filter-sheet {{
+.sb-filter-sheet {
   position: fixed;
   left: 0;
   right: 0;
@@ -1279,59 +1407,61 @@ def build_page_html(deals):
   box-shadow: 0 -8px 28px rgba(15, 23, 42, 0.18);
   transform: translateY(105%);
   transition: transform 0.22s ease-out;
+  will-change: transform;
   display: flex;
   flex-direction: column;
-}}
+  contain: content;
+}
 
-.sb-filter-sheet.open {{
+.sb-filter-sheet.open {
   transform: translateY(0);
-}}
+}
 
-.sb-filter-sheet-header {{
+.sb-filter-sheet-header {
   display: flex;
   align-items: center;
   justify-content: space-between;
   padding: 14px 16px;
   border-bottom: 1px solid var(--border-subtle);
-}}
+}
 
-.sb-filter-sheet-title {{
+.sb-filter-sheet-title {
   font-size: 18px;
   font-weight: 800;
-}}
+}
 
-.sb-filter-sheet-close {{
+.sb-filter-sheet-close {
   border: none;
   background: transparent;
   font-size: 24px;
   cursor: pointer;
   line-height: 1;
-}}
+}
 
-.sb-filter-sheet-body {{
+.sb-filter-sheet-body {
   overflow-y: auto;
   padding: 12px 16px 16px;
-}}
+}
 
-.sb-filter-sheet-group {{
+.sb-filter-sheet-group {
   margin-bottom: 14px;
-}}
+}
 
-.sb-filter-sheet-group-title {{
+.sb-filter-sheet-group-title {
   font-size: 13px;
   font-weight: 800;
   margin-bottom: 8px;
-}}
+}
 
-.sb-filter-sheet-footer {{
+.sb-filter-sheet-footer {
   display: flex;
   gap: 10px;
   padding: 12px 16px 16px;
   border-top: 1px solid var(--border-subtle);
-}}
+}
 
 .sb-filter-sheet-clear,
-.sb-filter-sheet-done {{
+.sb-filter-sheet-done {
   flex: 1;
   border-radius: 12px;
   padding: 12px;
@@ -1340,16 +1470,16 @@ def build_page_html(deals):
   cursor: pointer;
   border: 1px solid var(--border-subtle);
   background: #ffffff;
-}}
+}
 
-.sb-filter-sheet-done {{
+.sb-filter-sheet-done {
   background: var(--navy);
   color: #ffffff;
   border-color: var(--navy);
-}}
+}
 
-@media (min-width: 992px) {{
-  .sb-filter-sheet {{
+@media (min-width: 992px) {
+  .sb-filter-sheet {
     left: 50%;
     right: auto;
     bottom: auto;
@@ -1360,37 +1490,37 @@ def build_page_html(deals):
     transform: translate(-50%, -50%) scale(0.96);
     opacity: 0;
     pointer-events: none;
-  }}
-  .sb-filter-sheet.open {{
+  }
+  .sb-filter-sheet.open {
     transform: translate(-50%, -50%) scale(1);
     opacity: 1;
     pointer-events: auto;
-  }}
-  .sb-hero {{
+  }
+  .sb-hero {
     position: relative;
     z-index: 1;
-  }}
-}}
+  }
+}
 
-.sb-deals-shell {{
+.sb-deals-shell {
   max-width: 1100px;
   margin: 0 auto;
   padding: 0 16px;
-}}
+}
 
-.sb-deals-main {{
+.sb-deals-main {
   min-width: 0;
-}}
+}
 
         /* ============================ */
         /* SECTION 1B: HERO BANNER      */
         /* ============================ */
 
-        .sb-hero {{
+        .sb-hero {
             margin-top: 8px;
-        }}
+        }
 
-        .sb-hero-bg {{
+        .sb-hero-bg {
             max-width: 1100px;
             margin: 0 auto;
             border-radius: 18px;
@@ -1401,10 +1531,10 @@ def build_page_html(deals):
             color: #111827;
             box-shadow: 0 6px 16px rgba(15, 23, 42, 0.08);
             border: 1px solid #d8ebe0;
-        }}
+        }
 
         /* wallpaper brand texture */
-        .sb-hero-pattern {{
+        .sb-hero-pattern {
             position: absolute;
             inset: 0;
             opacity: 0.30;
@@ -1415,10 +1545,10 @@ def build_page_html(deals):
             /* Push muted grey doodles toward brand green */
             filter: brightness(1.08) contrast(1.05) sepia(0.48) saturate(2.4) hue-rotate(68deg);
             pointer-events: none;
-        }}
+        }
 
         /* soft wash so text stays readable without killing the green */
-        .sb-hero-bg::after {{
+        .sb-hero-bg::after {
             content: "";
             position: absolute;
             inset: 0;
@@ -1428,55 +1558,55 @@ def build_page_html(deals):
                 rgba(247, 252, 249, 0.22) 100%
             );
             pointer-events: none;
-        }}
+        }
 
-        .sb-hero-content {{
+        .sb-hero-content {
             position: relative;
             z-index: 2;
-        }}
+        }
 
-        .sb-hero-kicker {{
+        .sb-hero-kicker {
             font-size: 12px;
             color: #374151;
             margin-bottom: 4px;
-        }}
+        }
 
-        .sb-hero-title {{
+        .sb-hero-title {
             font-weight: 700;
             font-size: 20px;
             margin: 4px 0;
-        }}
+        }
 
-        @media (min-width: 768px) {{
-            .sb-hero-title {{
+        @media (min-width: 768px) {
+            .sb-hero-title {
                 font-size: 24px;
-            }}
-        }}
+            }
+        }
 
-        .sb-hero-subtitle {{
+        .sb-hero-subtitle {
             font-size: 14px;
             margin: 4px 0 10px;
             color: #374151;
-        }}
+        }
 
-        .sb-hero-tiers {{
+        .sb-hero-tiers {
             display: flex;
             flex-wrap: wrap;
             gap: 6px 12px;
             margin-top: 10px;
             align-items: center;
-        }}
+        }
 
-        .sb-hero-tiers-label {{
+        .sb-hero-tiers-label {
             font-size: 11px;
             font-weight: 700;
             letter-spacing: 0.04em;
             text-transform: uppercase;
             color: #64748b;
             margin-right: 2px;
-        }}
+        }
 
-        .sb-hero-tier {{
+        .sb-hero-tier {
             display: inline-flex;
             align-items: center;
             gap: 4px;
@@ -1484,14 +1614,14 @@ def build_page_html(deals):
             font-weight: 600;
             color: #475569;
             letter-spacing: 0.01em;
-        }}
+        }
 
-        .sb-hero-tier-icon {{
+        .sb-hero-tier-icon {
             font-size: 13px;
             line-height: 1;
-        }}
+        }
 
-        .sb-hero-cta {{
+        .sb-hero-cta {
             display: inline-block;
             padding: 8px 16px;
             border-radius: var(--radius-pill);
@@ -1500,32 +1630,45 @@ def build_page_html(deals):
             text-decoration: none;
             font-size: 13px;
             font-weight: 600;
-        }}
+        }
 
-        .sb-hero-cta:hover {{
+        .sb-hero-cta:hover {
             filter: brightness(1.02);
-        }}
+        }
 
         /* ============================ */
         /* SECTION 2: DEAL CARD GRID    */
         /* ============================ */
 
-        .card-grid {{
+        .card-grid {
             max-width: 1100px;
             margin: 0 auto;
             display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(240px, 1fr));
+            grid-template-columns: repeat(2, minmax(0, 1fr));
             gap: 14px;
-        }}
-
-        @media (max-width: 640px) {{
-            .card-grid {{
-                grid-template-columns: 1fr;
+        }
+
+        /* Fixed column counts; the breakpoints are where ~240px cards fit */
+        @media (min-width: 820px) {
+            .card-grid {
+                grid-template-columns: repeat(3, minmax(0, 1fr));
+            }
+        }
+
+        @media (min-width: 1080px) {
+            .card-grid {
+                grid-template-columns: repeat(4, minmax(0, 1fr));
+            }
+        }
+
+        @media (max-width: 640px) {
+            .card-grid {
+                grid-template-columns: minmax(0, 1fr);
                 gap: 12px;
-            }}
-        }}
+            }
+        }
 
-        .card {{
+        .card {
             background-color: var(--card-bg);
             border-radius: var(--radius-lg);
             border: 1px solid var(--border-subtle);
@@ -1533,9 +1676,12 @@ def build_page_html(deals):
             padding: 10px 10px 12px 10px;
             display: flex;
             flex-direction: column;
-        }}
+            contain: content;
+            content-visibility: auto;
+            contain-intrinsic-size: auto 260px auto 340px;
+        }
 
-        .card-tier-diamond {{
+        .card-tier-diamond {
             position: relative;
             overflow: hidden;
             background: linear-gradient(165deg, #dbeafe 0%, #eff6ff 42%, #f8fbff 100%);
@@ -1543,10 +1689,10 @@ def build_page_html(deals):
             box-shadow:
                 0 0 0 1px rgba(59, 130, 246, 0.22),
                 0 10px 28px rgba(37, 99, 235, 0.16);
-        }}
+        }
 
         /* Soft light sweep — unique delay + duration per card */
-        .card-tier-diamond::before {{
+        .card-tier-diamond::before {
             content: "";
             position: absolute;
             top: -30%;
@@ -1566,298 +1712,290 @@ def build_page_html(deals):
             transform: translateX(0) skewX(-14deg);
             animation: diamond-sheen var(--diamond-sheen-duration, 5s) ease-in-out infinite;
             animation-delay: var(--diamond-sheen-delay, 0s);
-        }}
+        }
 
-        @keyframes diamond-sheen {{
-            0% {{
+        @keyframes diamond-sheen {
+            0% {
                 transform: translateX(-30%) skewX(-14deg);
                 opacity: 0;
-            }}
-            8% {{
+            }
+            8% {
                 opacity: 0.85;
-            }}
-            28% {{
+            }
+            28% {
                 opacity: 0.85;
-            }}
-            40% {{
+            }
+            40% {
                 transform: translateX(280%) skewX(-14deg);
                 opacity: 0;
-            }}
-            100% {{
+            }
+            100% {
                 transform: translateX(280%) skewX(-14deg);
                 opacity: 0;
-            }}
-        }}
+            }
+        }
 
-        .diamond-sparkles {{
+        .diamond-sparkles {
             position: absolute;
             inset: 0;
             pointer-events: none;
             z-index: 5;
-        }}
+        }
 
-        .sparkle {{
+        .sparkle {
             position: absolute;
             opacity: 0;
             transform: scale(0.1);
             display: block;
             line-height: 0;
             animation: diamond-twinkle-a 7s linear infinite;
-        }}
+        }
 
-        .sparkle-svg {{
-            display: block;
-            width: 100%;
-            height: 100%;
-            overflow: visible;
-        }}
-
-        .sparkle-shape {{
-            fill: #ffffff;
-            stroke: #1e40af;
-            stroke-width: 4;
-            stroke-linejoin: miter;
-            stroke-miterlimit: 8;
-            paint-order: stroke fill;
+        /* Star image is --sparkle-image (sparkle_star_data_uri), padded 16% per side */
+        .sparkle::before {
+            content: "";
+            position: absolute;
+            inset: -16%;
+            background: var(--sparkle-image) center / contain no-repeat;
             filter: drop-shadow(0 0 4px rgba(37, 99, 235, 0.9));
-        }}
+        }
 
-        @keyframes diamond-twinkle-a {{
-            0%, 100% {{
+        @keyframes diamond-twinkle-a {
+            0%, 100% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-            8% {{
+            }
+            8% {
                 opacity: 0.55;
                 transform: scale(calc(var(--sparkle-peak, 1.15) * 0.45));
-            }}
-            14% {{
+            }
+            14% {
                 opacity: 1;
                 transform: scale(var(--sparkle-peak, 1.15));
-            }}
-            20% {{
+            }
+            20% {
                 opacity: 0.5;
                 transform: scale(calc(var(--sparkle-peak, 1.15) * 0.45));
-            }}
-            28% {{
+            }
+            28% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-            55% {{
+            }
+            55% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-            62% {{
+            }
+            62% {
                 opacity: 0.7;
                 transform: scale(calc(var(--sparkle-peak, 1.15) * 0.5));
-            }}
-            68% {{
+            }
+            68% {
                 opacity: 1;
                 transform: scale(calc(var(--sparkle-peak, 1.15) * 0.95));
-            }}
-            74% {{
+            }
+            74% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-        }}
+            }
+        }
 
-        @keyframes diamond-twinkle-b {{
-            0%, 100% {{
+        @keyframes diamond-twinkle-b {
+            0%, 100% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-            5% {{
+            }
+            5% {
                 opacity: 0.5;
                 transform: scale(calc(var(--sparkle-peak, 1.1) * 0.45));
-            }}
-            10% {{
+            }
+            10% {
                 opacity: 1;
                 transform: scale(var(--sparkle-peak, 1.1));
-            }}
-            15% {{
+            }
+            15% {
                 opacity: 0.45;
                 transform: scale(calc(var(--sparkle-peak, 1.1) * 0.45));
-            }}
-            20% {{
+            }
+            20% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-            40% {{
+            }
+            40% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-            46% {{
+            }
+            46% {
                 opacity: 0.55;
                 transform: scale(calc(var(--sparkle-peak, 1.1) * 0.45));
-            }}
-            52% {{
+            }
+            52% {
                 opacity: 1;
                 transform: scale(calc(var(--sparkle-peak, 1.1) * 0.95));
-            }}
-            58% {{
+            }
+            58% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-            78% {{
+            }
+            78% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-            84% {{
+            }
+            84% {
                 opacity: 0.65;
                 transform: scale(calc(var(--sparkle-peak, 1.1) * 0.5));
-            }}
-            90% {{
+            }
+            90% {
                 opacity: 1;
                 transform: scale(calc(var(--sparkle-peak, 1.1) * 0.9));
-            }}
-            96% {{
+            }
+            96% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-        }}
+            }
+        }
 
-        @keyframes diamond-twinkle-c {{
-            0%, 100% {{
+        @keyframes diamond-twinkle-c {
+            0%, 100% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-            18% {{
+            }
+            18% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-            24% {{
+            }
+            24% {
                 opacity: 0.55;
                 transform: scale(calc(var(--sparkle-peak, 1.2) * 0.45));
-            }}
-            30% {{
+            }
+            30% {
                 opacity: 1;
                 transform: scale(var(--sparkle-peak, 1.2));
-            }}
-            36% {{
+            }
+            36% {
                 opacity: 0.45;
                 transform: scale(calc(var(--sparkle-peak, 1.2) * 0.45));
-            }}
-            42% {{
+            }
+            42% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-            68% {{
+            }
+            68% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-            74% {{
+            }
+            74% {
                 opacity: 0.7;
                 transform: scale(calc(var(--sparkle-peak, 1.2) * 0.5));
-            }}
-            80% {{
+            }
+            80% {
                 opacity: 1;
                 transform: scale(calc(var(--sparkle-peak, 1.2) * 0.92));
-            }}
-            86% {{
+            }
+            86% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-        }}
+            }
+        }
 
-        @keyframes diamond-twinkle-d {{
-            0%, 100% {{
+        @keyframes diamond-twinkle-d {
+            0%, 100% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-            4% {{
+            }
+            4% {
                 opacity: 0.5;
                 transform: scale(calc(var(--sparkle-peak, 1) * 0.4));
-            }}
-            8% {{
+            }
+            8% {
                 opacity: 1;
                 transform: scale(calc(var(--sparkle-peak, 1) * 0.95));
-            }}
-            12% {{
+            }
+            12% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-            28% {{
+            }
+            28% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-            32% {{
+            }
+            32% {
                 opacity: 0.55;
                 transform: scale(calc(var(--sparkle-peak, 1) * 0.4));
-            }}
-            36% {{
+            }
+            36% {
                 opacity: 1;
                 transform: scale(calc(var(--sparkle-peak, 1) * 0.9));
-            }}
-            40% {{
+            }
+            40% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-            58% {{
+            }
+            58% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-            62% {{
+            }
+            62% {
                 opacity: 0.6;
                 transform: scale(calc(var(--sparkle-peak, 1) * 0.4));
-            }}
-            66% {{
+            }
+            66% {
                 opacity: 1;
                 transform: scale(calc(var(--sparkle-peak, 1) * 0.92));
-            }}
-            70% {{
+            }
+            70% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-            86% {{
+            }
+            86% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-            90% {{
+            }
+            90% {
                 opacity: 0.65;
                 transform: scale(calc(var(--sparkle-peak, 1) * 0.45));
-            }}
-            94% {{
+            }
+            94% {
                 opacity: 1;
                 transform: scale(calc(var(--sparkle-peak, 1) * 0.88));
-            }}
-            98% {{
+            }
+            98% {
                 opacity: 0;
                 transform: scale(0.05);
-            }}
-        }}
+            }
+        }
 
-        @media (prefers-reduced-motion: reduce) {{
-            .diamond-sparkles {{
+        @media (prefers-reduced-motion: reduce) {
+            .diamond-sparkles {
                 display: none;
-            }}
-            .card-tier-diamond::before {{
+            }
+            .card-tier-diamond::before {
                 animation: none;
                 opacity: 0;
-            }}
-        }}
+            }
+        }
 
-        .card-tier-fire {{
+        .card-tier-fire {
             background-color: #ffedd5;
             border-color: #f9a03f;
-        }}
+        }
 
-        .card-tier-strong {{
+        .card-tier-strong {
             background-color: #faf9f6;
             border-color: #e5dfd0;
-        }}
+        }
 
-        .card-tier-sale {{
+        .card-tier-sale {
             background-color: #fafafa;
             border-color: #e8eaed;
-        }}
+        }
 
-        .card-image-wrap {{
+        .card-image-wrap {
             position: relative;
             padding: 8px 4px;
             min-height: 130px;
-        }}
+        }
 
-        .card-carousel {{
+        .card-carousel {
             position: relative;
             width: 100%;
             display: grid;
@@ -1867,13 +2005,13 @@ def build_page_html(deals):
             column-gap: 2px;
             padding: 0;
             z-index: 1;
-        }}
+        }
 
-        .card-carousel--single {{
+        .card-carousel--single {
             grid-template-columns: minmax(0, 1fr);
-        }}
+        }
 
-        .card-carousel-stage {{
+        .card-carousel-stage {
             grid-column: 2;
             grid-row: 1;
             position: relative;
@@ -1882,13 +2020,13 @@ def build_page_html(deals):
             align-items: center;
             justify-content: center;
             overflow: hidden;
-        }}
+        }
 
-        .card-carousel--single .card-carousel-stage {{
+        .card-carousel--single .card-carousel-stage {
             grid-column: 1;
-        }}
+        }
 
-        .card-carousel-slide {{
+        .card-carousel-slide {
             position: absolute;
             left: 50%;
             top: 50%;
@@ -1899,50 +2037,50 @@ def build_page_html(deals):
             opacity: 0;
             pointer-events: none;
             z-index: 1;
-        }}
+        }
 
-        .card-carousel-slide.is-active {{
+        .card-carousel-slide.is-active {
             transform: translate(-50%, -50%) scale(1);
             opacity: 1;
             pointer-events: auto;
             z-index: 2;
-        }}
+        }
 
-        .card-carousel-slide.is-prev {{
+        .card-carousel-slide.is-prev {
             transform: translate(calc(-50% - 58%), -50%) scale(0.82);
             opacity: 0.42;
             z-index: 1;
-        }}
+        }
 
-        .card-carousel-slide.is-next {{
+        .card-carousel-slide.is-next {
             transform: translate(calc(-50% + 58%), -50%) scale(0.82);
             opacity: 0.42;
             z-index: 1;
-        }}
+        }
 
-        .card-carousel-slide.is-hidden {{
+        .card-carousel-slide.is-hidden {
             opacity: 0;
             z-index: 0;
-        }}
+        }
 
-        .card-carousel-link {{
+        .card-carousel-link {
             display: flex;
             align-items: center;
             justify-content: center;
             width: 100%;
             height: 100%;
             text-decoration: none;
-        }}
+        }
 
-        .card-image {{
+        .card-image {
             max-width: 100%;
             max-height: 110px;
             object-fit: contain;
             display: block;
-        }}
+        }
 
         .card-carousel-prev,
-        .card-carousel-next {{
+        .card-carousel-next {
             position: relative;
             top: auto;
             transform: none;
@@ -1960,24 +2098,24 @@ def build_page_html(deals):
             padding: 0;
             cursor: pointer;
             box-shadow: 0 1px 4px rgba(15, 23, 42, 0.12);
-        }}
+        }
 
-        .card-carousel-prev {{
+        .card-carousel-prev {
             grid-column: 1;
             grid-row: 1;
-        }}
+        }
 
-        .card-carousel-next {{
+        .card-carousel-next {
             grid-column: 3;
             grid-row: 1;
-        }}
+        }
 
         .card-carousel-prev:hover,
-        .card-carousel-next:hover {{
+        .card-carousel-next:hover {
             filter: brightness(0.98);
-        }}
+        }
 
-        .card-carousel-caption {{
+        .card-carousel-caption {
             grid-column: 1 / -1;
             grid-row: 2;
             margin-top: 4px;
@@ -1988,19 +2126,19 @@ def build_page_html(deals):
             line-height: 1.25;
             padding: 0 4px;
             min-height: 14px;
-        }}
+        }
 
-        @media (max-width: 640px) {{
-            .card-carousel-slide.is-prev {{
+        @media (max-width: 640px) {
+            .card-carousel-slide.is-prev {
                 transform: translate(calc(-50% - 48%), -50%) scale(0.78);
-            }}
+            }
 
-            .card-carousel-slide.is-next {{
+            .card-carousel-slide.is-next {
                 transform: translate(calc(-50% + 48%), -50%) scale(0.78);
-            }}
-        }}
+            }
+        }
 
-        .card-category-tag {{
+        .card-category-tag {
             position: absolute;
             top: 6px;
             right: 8px;
@@ -2011,9 +2149,9 @@ def build_page_html(deals):
             text-align: right;
             line-height: 1.25;
             pointer-events: none;
-        }}
+        }
 
-        .pack-pill {{
+        .pack-pill {
             position: absolute;
             bottom: 6px;
             right: 8px;
@@ -2026,20 +2164,20 @@ def build_page_html(deals):
             display: inline-flex;
             align-items: center;
             gap: 2px;
-        }}
+        }
 
-        .pack-count {{
+        .pack-count {
             font-weight: 700;
             text-transform: uppercase;
             font-size: 11px;
-        }}
+        }
 
-        .pack-unit {{
+        .pack-unit {
             text-transform: uppercase;
             font-size: 10px;
-        }}
+        }
 
-        .badge {{
+        .badge {
             position: absolute;
             top: 6px;
             left: 8px;
@@ -2054,23 +2192,23 @@ def build_page_html(deals):
             background-color: #ffffff;
             border: 1px solid #e5e7eb;
             box-shadow: 0 1px 2px rgba(15, 23, 42, 0.08);
-        }}
+        }
 
-        .badge-strong {{
+        .badge-strong {
             color: var(--orange);
             border-color: #fdba74;
-        }}
+        }
 
-        .badge-fire-pill {{
+        .badge-fire-pill {
             overflow: hidden;
-        }}
+        }
 
-        .fire-pill-label {{
+        .fire-pill-label {
             position: relative;
             z-index: 2;
-        }}
+        }
 
-        .fire-pill-flames {{
+        .fire-pill-flames {
             position: absolute;
             left: 0;
             right: 0;
@@ -2082,211 +2220,211 @@ def build_page_html(deals):
             transform: scaleY(0.15) translateY(3px);
             transform-origin: center bottom;
             animation: fire-pill-flames-rise 9s linear infinite;
-        }}
+        }
 
-        .fire-pill-flames-svg {{
+        .fire-pill-flames-svg {
             display: block;
             width: 100%;
             height: 100%;
-        }}
+        }
 
-        .fire-pill-spark {{
+        .fire-pill-spark {
             opacity: 0;
             transform-origin: center center;
             animation: fire-pill-spark-pop 9s linear infinite;
             animation-delay: inherit;
-        }}
+        }
 
-        @keyframes fire-pill-flames-rise {{
-            0%, 48%, 100% {{
+        @keyframes fire-pill-flames-rise {
+            0%, 48%, 100% {
                 opacity: 0;
                 transform: scaleY(0.12) translateY(4px);
-            }}
-            54% {{
+            }
+            54% {
                 opacity: 0.55;
                 transform: scaleY(0.5) translateY(2px);
-            }}
-            60% {{
+            }
+            60% {
                 opacity: 1;
                 transform: scaleY(0.95) translateY(0);
-            }}
-            72% {{
+            }
+            72% {
                 opacity: 1;
                 transform: scaleY(1.08) translateY(-1px);
-            }}
-            84% {{
+            }
+            84% {
                 opacity: 0.85;
                 transform: scaleY(0.85) translateY(0);
-            }}
-            92% {{
+            }
+            92% {
                 opacity: 0.45;
                 transform: scaleY(0.45) translateY(2px);
-            }}
-            97% {{
+            }
+            97% {
                 opacity: 0;
                 transform: scaleY(0.1) translateY(4px);
-            }}
-        }}
+            }
+        }
 
-        @keyframes fire-pill-spark-pop {{
-            0%, 56%, 100% {{
+        @keyframes fire-pill-spark-pop {
+            0%, 56%, 100% {
                 opacity: 0;
                 transform: translateY(6px) scale(0.4);
-            }}
-            62% {{
+            }
+            62% {
                 opacity: 0.85;
                 transform: translateY(0) scale(1);
-            }}
-            74% {{
+            }
+            74% {
                 opacity: 0.7;
                 transform: translateY(-2px) scale(0.95);
-            }}
-            86% {{
+            }
+            86% {
                 opacity: 0.35;
                 transform: translateY(-5px) scale(0.7);
-            }}
-            94% {{
+            }
+            94% {
                 opacity: 0;
                 transform: translateY(-7px) scale(0.35);
-            }}
-        }}
+            }
+        }
 
-        @media (prefers-reduced-motion: reduce) {{
+        @media (prefers-reduced-motion: reduce) {
             .fire-pill-flames,
-            .fire-pill-spark {{
+            .fire-pill-spark {
                 animation: none;
                 opacity: 0;
-            }}
-        }}
+            }
+        }
 
-        .badge-regular {{
+        .badge-regular {
             background-color: #fefce8;
             color: #854d0e;
             border: 1px solid #facc15;
-        }}
+        }
 
-        .badge-elite {{
+        .badge-elite {
             color: #1e3a8a;
             border-color: #60a5fa;
             background: linear-gradient(180deg, #ffffff 0%, #dbeafe 100%);
             box-shadow: 0 0 0 1px rgba(59, 130, 246, 0.2), 0 2px 8px rgba(37, 99, 235, 0.2);
             animation: diamond-badge-glow 2.8s ease-in-out infinite;
             animation-delay: var(--diamond-badge-delay, 0s);
-        }}
+        }
 
-        @keyframes diamond-badge-glow {{
-            0%, 100% {{
+        @keyframes diamond-badge-glow {
+            0%, 100% {
                 box-shadow: 0 0 0 1px rgba(59, 130, 246, 0.2), 0 2px 8px rgba(37, 99, 235, 0.18);
-            }}
-            50% {{
+            }
+            50% {
                 box-shadow: 0 0 0 1px rgba(59, 130, 246, 0.45), 0 3px 12px rgba(37, 99, 235, 0.35);
-            }}
-        }}
+            }
+        }
 
-        .badge-protein {{
+        .badge-protein {
             color: #854d0e;
             border-color: #facc15;
-        }}
+        }
 
-        .badge-everyday {{
+        .badge-everyday {
             color: #6b7280;
             border-color: #d1d5db;
-        }}
+        }
 
-        .card-content {{
+        .card-content {
             padding: 4px 6px 12px 6px;
             display: flex;
             flex-direction: column;
             gap: 6px;
             flex: 1;
-        }}
+        }
 
-        .card-meta-row {{
+        .card-meta-row {
             display: flex;
             align-items: center;
             gap: 6px;
             font-size: 11px;
-        }}
+        }
 
-        .retailer-pill {{
+        .retailer-pill {
             padding: 3px 8px;
             border-radius: var(--radius-pill);
             font-size: 11px;
             font-weight: 600;
-        }}
+        }
 
-        .retailer-walmart {{
+        .retailer-walmart {
             background-color: #0071CE;
             color: #F9C80E;
-        }}
+        }
 
-        .retailer-kroger {{
+        .retailer-kroger {
             background-color: #003087;
             color: #ffffff;
-        }}
+        }
 
-        .retailer-target {{
+        .retailer-target {
             background-color: #CC0000;
             color: #ffffff;
-        }}
+        }
 
-        .retailer-meijer {{
+        .retailer-meijer {
             background-color: #004F91;
             color: #E31837;
             font-weight: 700;
-        }}
+        }
 
-        .retailer-harris-teeter {{
+        .retailer-harris-teeter {
             background-color: #8E2344;
             color: #ffffff;
-        }}
+        }
 
-        .retailer-generic {{
+        .retailer-generic {
             background-color: #6b7280;
             color: #ffffff;
-        }}
+        }
 
-        .meta-category {{
+        .meta-category {
             color: var(--text-muted);
-        }}
+        }
 
-        .card-title {{
+        .card-title {
             font-size: 14px;
             font-weight: 600;
             line-height: 1.25;
             min-height: 34px;
             margin-bottom: -20px;
-        }}
+        }
 
-        .card-pricing {{
+        .card-pricing {
             display: flex;
             align-items: baseline;
             gap: 6px;
             font-size: 13px;
             margin-top: 0;
             margin-bottom: 0;
-        }}
+        }
 
-        .old-price {{
+        .old-price {
             color: #ef4444;
             text-decoration: line-through;
-        }}
+        }
 
-        .new-price {{
+        .new-price {
             color: var(--text-main);
             font-weight: 700;
-        }}
+        }
 
-        .percent-off {{
+        .percent-off {
             color: var(--green);
             font-size: 18px;
             font-weight: 700;
             text-transform: uppercase;
             letter-spacing: 0.03em;
             line-height: 1;
-        }}
+        }
 
-        .card-footer {{
+        .card-footer {
             display: flex;
             flex-wrap: wrap;
             justify-content: space-between;
@@ -2294,19 +2432,19 @@ def build_page_html(deals):
             gap: 4px;
             margin-top: 2px;
             font-size: 11px;
-        }}
+        }
 
-        .availability.check {{
+        .availability.check {
             font-style: italic;
             color: var(--text-muted);
-        }}
+        }
 
-        .streak {{
+        .streak {
             color: var(--text-muted);
             font-style: italic;
-        }}
+        }
 
-        .view-button {{
+        .view-button {
             margin-top: auto;
             display: block;
             text-align: center;
@@ -2315,64 +2453,64 @@ def build_page_html(deals):
             font-size: 13px;
             font-weight: 600;
             text-decoration: none;
-        }}
+        }
 
-        .view-walmart {{
+        .view-walmart {
             background-color: #0071CE;
             color: #F9C80E;
-        }}
+        }
 
-        .view-kroger {{
+        .view-kroger {
             background-color: #003087;
             color: #ffffff;
-        }}
+        }
 
-        .view-target {{
+        .view-target {
             background-color: #CC0000;
             color: #ffffff;
-        }}
+        }
 
-        .view-meijer {{
+        .view-meijer {
             background-color: #004F91;
             color: #E31837;
             font-weight: 700;
-        }}
+        }
 
-        .view-harris-teeter {{
+        .view-harris-teeter {
             background-color: #8E2344;
             color: #ffffff;
-        }}
+        }
 
-        .view-generic {{
+        .view-generic {
             background-color: #4b5563;
             color: #ffffff;
-        }}
+        }
 
-        .view-button:hover {{
+        .view-button:hover {
             filter: brightness(0.95);
-        }}
+        }
 
         /* ============================ */
         /* FLAVOR EXPANDABLE LIST       */
         /* ============================ */
 
-        .flavor-info {{
+        .flavor-info {
             font-size: 12px;
             color: var(--text-main);
             margin-top: 0;
             margin-bottom: 0;
             line-height: 1.4;
-        }}
+        }
 
-        .flavor-label {{
+        .flavor-label {
             color: var(--text-muted);
-        }}
+        }
 
-        .flavor-sample {{
+        .flavor-sample {
             color: var(--text-main);
-        }}
+        }
 
-        .flavor-expand-link {{
+        .flavor-expand-link {
             background: none;
             border: none;
             color: var(--blue);
@@ -2382,139 +2520,35 @@ def build_page_html(deals):
             margin-left: 4px;
             text-decoration: underline;
             font-weight: 600;
-        }}
+        }
 
-        .flavor-expand-link:hover {{
+        .flavor-expand-link:hover {
             color: #1e40af;
-        }}
+        }
 
-        .flavor-list-expanded {{
+        .flavor-list-expanded {
             margin-top: 6px;
             display: flex;
             flex-direction: column;
             gap: 4px;
-        }}
+        }
 
-        .flavor-link {{
+        .flavor-link {
             color: var(--blue);
             text-decoration: none;
             font-size: 12px;
             padding: 2px 0;
-        }}
+        }
 
-        .flavor-link:hover {{
+        .flavor-link:hover {
             color: #1e40af;
             text-decoration: underline;
-        }}
-
-        /* ============================ */
-        /* SECTION 3: INFO SECTIONS     */
-        /* ============================ */
-
-        .sb-info {{
-            max-width: 1100px;
-            margin: 18px auto 0;
-        }}
-
-        .sb-info-card {{
-            background: #ffffff;
-            border: 1px solid var(--border-subtle);
-            border-radius: var(--radius-lg);
-            box-shadow: var(--shadow-soft);
-            padding: 14px 14px;
-            margin-top: 14px;
-        }}
-
-        .sb-info-title {{
-            font-size: 16px;
-            font-weight: 800;
-            margin: 0 0 6px 0;
-        }}
-
-        .sb-info-text {{
-            margin: 0;
-            color: var(--text-main);
-            line-height: 1.55;
-            font-size: 14px;
-        }}
-
-        .sb-subscribe-row {{
-            margin-top: 10px;
-            display: flex;
-            flex-wrap: wrap;
-            gap: 10px;
-            align-items: center;
-        }}
-
-        .sb-email {{
-            flex: 1;
-            min-width: 220px;
-            padding: 10px 12px;
-            border-radius: 12px;
-            border: 1px solid var(--border-subtle);
-            font-size: 14px;
-        }}
-
-        .sb-subscribe-btn {{
-            padding: 10px 14px;
-            border-radius: 12px;
-            border: none;
-            background: var(--navy);
-            color: #ffffff;
-            font-weight: 800;
-            cursor: pointer;
-            font-size: 14px;
-        }}
-
-        .sb-subscribe-btn:hover {{
-            filter: brightness(1.03);
-        }}
-
-.sb-subscribe-btn{{
-  display: inline-flex;
-  align-items: center;
-  justify-content: center;
-  text-decoration: none;
-}}
-
-.sb-subscribe-alt{{
-  font-size: 13px;
-  color: var(--text-muted);
-  text-decoration: underline;
-  font-weight: 600;
-}}
-
-        .sb-note {{
-            margin-top: 10px;
-            font-size: 13px;
-            color: var(--text-muted);
-            line-height: 1.45;
-        }}
-
-        .sb-site-footer {{
-            max-width: 1100px;
-            margin: 0 auto;
-            padding: 8px 16px 28px;
-        }}
-
-        .sb-site-footer p {{
-            margin: 0;
-            font-size: 12px;
-            line-height: 1.5;
-            color: var(--text-muted);
-            max-width: 52rem;
-        }}
-
-        @media (max-width: 640px) {{
-            .page {{
-                padding-top: 8px;
-            }}
-        }}
+        }
 
         /* ============================ */
         /* WELCOME / PREFS EXPERIENCE   */
         /* ============================ */
-        .sb-welcome {{
+        .sb-welcome {
             position: fixed;
             inset: 0;
             z-index: 10050;
@@ -2524,25 +2558,25 @@ def build_page_html(deals):
             opacity: 0;
             pointer-events: none;
             transition: opacity 0.35s ease;
-        }}
-        .sb-welcome.open {{
+        }
+        .sb-welcome.open {
             opacity: 1;
             pointer-events: auto;
-        }}
-        .sb-welcome-backdrop {{
+        }
+        .sb-welcome-backdrop {
             position: absolute;
             inset: 0;
             /* Frosted glass over the live deals page (unfiltered on first step) */
             background: rgba(243, 244, 246, 0.35);
             -webkit-backdrop-filter: blur(18px) saturate(1.15);
             backdrop-filter: blur(18px) saturate(1.15);
-        }}
-        @supports not ((backdrop-filter: blur(1px)) or (-webkit-backdrop-filter: blur(1px))) {{
-            .sb-welcome-backdrop {{
+        }
+        @supports not ((backdrop-filter: blur(1px)) or (-webkit-backdrop-filter: blur(1px))) {
+            .sb-welcome-backdrop {
                 background: rgba(15, 23, 42, 0.45);
-            }}
-        }}
-        .sb-welcome-panel {{
+            }
+        }
+        .sb-welcome-panel {
             position: relative;
             z-index: 1;
             width: min(560px, 100%);
@@ -2558,11 +2592,11 @@ def build_page_html(deals):
             font-family: "Outfit", system-ui, sans-serif;
             transform: translateY(18px) scale(0.98);
             transition: transform 0.4s cubic-bezier(0.22, 1, 0.36, 1);
-        }}
-        .sb-welcome.open .sb-welcome-panel {{
+        }
+        .sb-welcome.open .sb-welcome-panel {
             transform: translateY(0) scale(1);
-        }}
-        .sb-welcome-brand {{
+        }
+        .sb-welcome-brand {
             font-family: "Fraunces", Georgia, serif;
             font-weight: 700;
             font-size: clamp(2rem, 6vw, 2.75rem);
@@ -2570,11 +2604,11 @@ def build_page_html(deals):
             letter-spacing: -0.03em;
             color: var(--navy);
             margin: 0 0 10px;
-        }}
-        .sb-welcome-brand span {{
+        }
+        .sb-welcome-brand span {
             color: var(--blue);
-        }}
-        .sb-welcome-kicker {{
+        }
+        .sb-welcome-kicker {
             display: inline-block;
             font-size: 12px;
             font-weight: 600;
@@ -2582,44 +2616,44 @@ def build_page_html(deals):
             text-transform: uppercase;
             color: var(--green);
             margin-bottom: 8px;
-        }}
-        .sb-welcome-lead {{
+        }
+        .sb-welcome-lead {
             margin: 0 0 22px;
             font-size: 1.05rem;
             line-height: 1.45;
             color: #334155;
             max-width: 28ch;
-        }}
-        .sb-welcome-step {{
+        }
+        .sb-welcome-step {
             display: none;
             animation: sbWelcomeIn 0.4s ease both;
-        }}
-        .sb-welcome-step.is-active {{
+        }
+        .sb-welcome-step.is-active {
             display: block;
-        }}
-        @keyframes sbWelcomeIn {{
-            from {{ opacity: 0; transform: translateY(10px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
-        .sb-welcome-step-title {{
+        }
+        @keyframes sbWelcomeIn {
+            from { opacity: 0; transform: translateY(10px); }
+            to { opacity: 1; transform: translateY(0); }
+        }
+        .sb-welcome-step-title {
             font-family: "Fraunces", Georgia, serif;
             font-size: 1.45rem;
             margin: 0 0 6px;
             color: var(--navy);
-        }}
-        .sb-welcome-step-text {{
+        }
+        .sb-welcome-step-text {
             margin: 0 0 16px;
             color: var(--text-muted);
             font-size: 0.95rem;
             line-height: 1.4;
-        }}
-        .sb-welcome-chips {{
+        }
+        .sb-welcome-chips {
             display: flex;
             flex-wrap: wrap;
             gap: 8px;
             margin-bottom: 18px;
-        }}
-        .sb-welcome-chip {{
+        }
+        .sb-welcome-chip {
             appearance: none;
             border: 1.5px solid #cbd5e1;
             background: #fff;
@@ -2631,32 +2665,32 @@ def build_page_html(deals):
             font-size: 14px;
             cursor: pointer;
             transition: transform 0.15s ease, background 0.15s ease, border-color 0.15s ease, color 0.15s ease;
-        }}
-        .sb-welcome-chip:hover {{
+        }
+        .sb-welcome-chip:hover {
             transform: translateY(-1px);
             border-color: var(--blue);
             color: var(--blue);
-        }}
-        .sb-welcome-chip.is-on {{
+        }
+        .sb-welcome-chip.is-on {
             background: var(--blue);
             border-color: var(--blue);
             color: #fff;
-        }}
-        .sb-welcome-preview {{
+        }
+        .sb-welcome-preview {
             min-height: 1.25em;
             margin: 0 0 16px;
             font-size: 13px;
             font-weight: 600;
             color: var(--green);
-        }}
-        .sb-welcome-actions {{
+        }
+        .sb-welcome-actions {
             display: flex;
             flex-wrap: wrap;
             gap: 10px;
             align-items: center;
             margin-top: 8px;
-        }}
-        .sb-welcome-btn {{
+        }
+        .sb-welcome-btn {
             appearance: none;
             border: none;
             border-radius: 14px;
@@ -2668,35 +2702,35 @@ def build_page_html(deals):
             background: var(--blue);
             color: #fff;
             transition: filter 0.15s ease, transform 0.15s ease;
-        }}
-        .sb-welcome-btn:hover {{
+        }
+        .sb-welcome-btn:hover {
             filter: brightness(1.06);
             transform: translateY(-1px);
-        }}
-        .sb-welcome-btn:disabled {{
+        }
+        .sb-welcome-btn:disabled {
             opacity: 0.45;
             cursor: not-allowed;
             transform: none;
-        }}
-        .sb-welcome-btn-ghost {{
+        }
+        .sb-welcome-btn-ghost {
             background: transparent;
             color: var(--text-muted);
             font-weight: 600;
             padding: 10px 8px;
-        }}
-        .sb-welcome-btn-ghost:hover {{
+        }
+        .sb-welcome-btn-ghost:hover {
             color: var(--blue);
             filter: none;
             transform: none;
-        }}
-        .sb-welcome-email-row {{
+        }
+        .sb-welcome-email-row {
             display: flex;
             flex-direction: column;
             gap: 10px;
             margin: 4px 0 10px;
             width: 100%;
-        }}
-        .sb-welcome-email {{
+        }
+        .sb-welcome-email {
             width: 100%;
             box-sizing: border-box;
             padding: 14px 16px;
@@ -2710,12 +2744,12 @@ def build_page_html(deals):
             background: #ffffff;
             -webkit-appearance: none;
             appearance: none;
-        }}
-        .sb-welcome-email:focus {{
+        }
+        .sb-welcome-email:focus {
             outline: 2px solid rgba(37, 99, 235, 0.35);
             border-color: var(--blue);
-        }}
-        .sb-welcome-email-submit {{
+        }
+        .sb-welcome-email-submit {
             width: 100%;
             box-sizing: border-box;
             padding: 14px 16px;
@@ -2727,77 +2761,77 @@ def build_page_html(deals):
             font-size: 16px;
             font-weight: 700;
             cursor: pointer;
-        }}
-        .sb-welcome-email-submit:hover {{
+        }
+        .sb-welcome-email-submit:hover {
             background: #1e293b;
-        }}
-        .sb-welcome-email-submit:disabled {{
+        }
+        .sb-welcome-email-submit:disabled {
             opacity: 0.55;
             cursor: not-allowed;
-        }}
-        @media (min-width: 520px) {{
-            .sb-welcome-email-row {{
+        }
+        @media (min-width: 520px) {
+            .sb-welcome-email-row {
                 flex-direction: row;
                 align-items: stretch;
-            }}
-            .sb-welcome-email {{
+            }
+            .sb-welcome-email {
                 flex: 1;
                 min-width: 0;
-            }}
-            .sb-welcome-email-submit {{
+            }
+            .sb-welcome-email-submit {
                 width: auto;
                 flex: 0 0 auto;
                 padding-left: 22px;
                 padding-right: 22px;
-            }}
-        }}
-        .sb-welcome-note {{
+            }
+        }
+        .sb-welcome-note {
             margin: 0 0 12px;
             font-size: 12px;
             color: var(--text-muted);
             line-height: 1.4;
-        }}
-        .sb-welcome-status {{
+        }
+        .sb-welcome-status {
             min-height: 1.2em;
             margin: 0 0 8px;
             font-size: 13px;
             font-weight: 600;
             color: var(--green);
-        }}
-        .sb-welcome-status.is-error {{
+        }
+        .sb-welcome-status.is-error {
             color: var(--red);
-        }}
-        .sb-welcome-progress {{
+        }
+        .sb-welcome-progress {
             display: flex;
             gap: 6px;
             margin-bottom: 18px;
-        }}
-        .sb-welcome-dot {{
+        }
+        .sb-welcome-dot {
             width: 8px;
             height: 8px;
             border-radius: 999px;
             background: #cbd5e1;
             transition: background 0.2s ease, width 0.2s ease;
-        }}
-        .sb-welcome-dot.is-on {{
+        }
+        .sb-welcome-dot.is-on {
             background: var(--green);
             width: 22px;
-        }}
-        .sb-welcome-other {{
+        }
+        .sb-welcome-other {
             margin: 0 0 14px;
             padding: 12px 14px;
             border-radius: 14px;
             background: rgba(37, 99, 235, 0.06);
             border: 1px solid rgba(37, 99, 235, 0.15);
-        }}
-        .sb-welcome-other-label {{
+        }
+        .sb-welcome-other-label {
             display: block;
             font-size: 13px;
             font-weight: 700;
             color: var(--navy);
             margin-bottom: 6px;
-        }}
-        .sb-welcome-other-input {{
+        }
+        .sb-welcome-other-input {
             width: 100%;
             padding: 10px 12px;
             border-radius: 12px;
@@ -2805,66 +2839,215 @@ def build_page_html(deals):
             font: inherit;
             font-size: 14px;
             box-sizing: border-box;
-        }}
-        .sb-welcome-other-input:focus {{
+        }
+        .sb-welcome-other-input:focus {
             outline: 2px solid rgba(37, 99, 235, 0.35);
             border-color: var(--blue);
-        }}
-        .sb-welcome-other-hint {{
+        }
+        .sb-welcome-other-hint {
             margin: 6px 0 0;
             font-size: 12px;
             color: var(--text-muted);
             line-height: 1.35;
-        }}
-        body.sb-welcome-lock {{
+        }
+        body.sb-welcome-lock {
+            overflow: hidden;
+        }
+        .sb-welcome-signup {
+            margin: 8px 0 4px;
+            width: 100%;
+        }
+        .sb-welcome-signup-frame {
+            position: absolute;
+            width: 0;
+            height: 0;
+            border: 0;
             overflow: hidden;
+            clip: rect(0, 0, 0, 0);
+        }
+
+"""
+
+# Generated: the sparkle image shared by every diamond card
+CRITICAL_CSS += f"""
+        :root {{
+            --sparkle-image: url("{sparkle_star_data_uri()}");
         }}
+"""
+
+# Everything below the deal grid (info sections, footer). Written
+# next to index.html as styles.css and loaded without blocking first paint; it
+# is static, so browsers cache it between deal updates.
+PAGE_CSS = """
+        /* ============================ */
+        /* SECTION 3: INFO SECTIONS     */
+        /* ============================ */
+
+        .sb-info {
+            max-width: 1100px;
+            margin: 18px auto 0;
+        }
+
+        .sb-info-card {
+            background: #ffffff;
+            border: 1px solid var(--border-subtle);
+            border-radius: var(--radius-lg);
+            box-shadow: var(--shadow-soft);
+            padding: 14px 14px;
+            margin-top: 14px;
+            contain: content;
+        }
+
+        .sb-info-title {
+            font-size: 16px;
+            font-weight: 800;
+            margin: 0 0 6px 0;
+        }
+
+        .sb-info-text {
+            margin: 0;
+            color: var(--text-main);
+            line-height: 1.55;
+            font-size: 14px;
+        }
 
-        .sb-subscribe-form {{
+        .sb-subscribe-row {
+            margin-top: 10px;
+            display: flex;
+            flex-wrap: wrap;
+            gap: 10px;
+            align-items: center;
+        }
+
+        .sb-email {
+            flex: 1;
+            min-width: 220px;
+            padding: 10px 12px;
+            border-radius: 12px;
+            border: 1px solid var(--border-subtle);
+            font-size: 14px;
+        }
+
+        .sb-subscribe-btn {
+            padding: 10px 14px;
+            border-radius: 12px;
+            border: none;
+            background: var(--navy);
+            color: #ffffff;
+            font-weight: 800;
+            cursor: pointer;
+            font-size: 14px;
+        }
+
+        .sb-subscribe-btn:hover {
+            filter: brightness(1.03);
+        }
+
+.sb-subscribe-btn{
+  display: inline-flex;
+  align-items: center;
+  justify-content: center;
+  text-decoration: none;
+}
+
+.sb-subscribe-alt{
+  font-size: 13px;
+  color: var(--text-muted);
+  text-decoration: underline;
+  font-weight: 600;
+}
+
+        .sb-note {
+            margin-top: 10px;
+            font-size: 13px;
+            color: var(--text-muted);
+            line-height: 1.45;
+        }
+
+        .sb-site-footer {
+            max-width: 1100px;
+            margin: 0 auto;
+            padding: 8px 16px 28px;
+        }
+
+        .sb-site-footer p {
+            margin: 0;
+            font-size: 12px;
+            line-height: 1.5;
+            color: var(--text-muted);
+            max-width: 52rem;
+        }
+
+
+        .sb-subscribe-form {
             display: flex;
             flex-wrap: wrap;
             gap: 8px;
             margin-top: 10px;
             align-items: center;
-        }}
-        .sb-subscribe-form .sb-email {{
+        }
+        .sb-subscribe-form .sb-email {
             flex: 1;
             min-width: 200px;
-        }}
-        .sb-beehiiv-embed {{
+        }
+        .sb-beehiiv-embed {
             margin-top: 10px;
             width: 100%;
             max-width: 520px;
             min-height: 120px;
-        }}
-        .sb-beehiiv-embed iframe {{
+        }
+        .sb-beehiiv-embed iframe {
             max-width: 100% !important;
-        }}
-        .sb-welcome-signup {{
-            margin: 8px 0 4px;
-            width: 100%;
-        }}
-        .sb-welcome-signup-frame {{
-            position: absolute;
-            width: 0;
-            height: 0;
-            border: 0;
-            overflow: hidden;
-            clip: rect(0, 0, 0, 0);
-        }}
-        .sb-subscribe-status {{
+        }
+        .sb-subscribe-status {
             width: 100%;
             margin: 6px 0 0;
             font-size: 13px;
             font-weight: 600;
             color: var(--green);
             min-height: 1.2em;
-        }}
-        .sb-subscribe-status.is-error {{
+        }
+        .sb-subscribe-status.is-error {
             color: var(--red);
-        }}
-    </style>
+        }
+"""
+
+# What actually ships; the constants above stay readable for editing
+CRITICAL_CSS_MIN = minify_css(CRITICAL_CSS)
+PAGE_CSS_MIN = minify_css(PAGE_CSS)
+
+# Bumped whenever the stylesheet changes so browsers refetch it
+STYLESHEET_HREF = f"{STYLESHEET_PATH.name}?v={zlib.crc32(PAGE_CSS_MIN.encode('utf-8')):08x}"
+
+
+# Static page shell. Only the ${...} slots change between builds, so the
+# template is parsed once at import instead of re-formatting the whole
+# CSS/JS literal on every render.
+PAGE_TEMPLATE = string.Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8" />
+    <title>SnackBuddy Daily Deals</title>
+    <meta name="viewport" content="width=device-width, initial-scale=1" />
+    <!-- Above-the-fold images: fetch alongside the CSS instead of after body parse -->
+    <link rel="preload" as="image" href="assets/logo-transparent.png" />
+    <link rel="preload" as="image" href="assets/hero-wallpaper.png" />
+    <link rel="preconnect" href="https://fonts.googleapis.com" />
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin />
+    <link href="https://fonts.googleapis.com/css2?family=Fraunces:opsz,wght@9..144,600;9..144,700&family=Outfit:wght@400;500;600;700&display=swap" rel="stylesheet" />
+    <!-- Google tag (gtag.js) -->
+    <script async src="https://www.googletagmanager.com/gtag/js?id=G-N900K39W95"></script>
+    <script>
+      window.dataLayer = window.dataLayer || [];
+      function gtag(){dataLayer.push(arguments);}
+      gtag('js', new Date());
+      gtag('config', 'G-N900K39W95');
+    </script>
+    <style>${critical_css}${filter_css}</style>
+    <link rel="stylesheet" href="${stylesheet_href}" media="print" onload="this.media='all'" />
+    <noscript><link rel="stylesheet" href="${stylesheet_href}" /></noscript>
 </head>
+<body>
 <!-- NAV backdrop (right drawer) -->
 <div class="sb-nav-backdrop" id="sb-nav-backdrop"></div>
 
@@ -2873,7 +3056,7 @@ def build_page_html(deals):
   <div class="sb-nav-inner">
     <div class="sb-nav-header">
       <div class="sb-nav-header-left">
-        <img src="assets/logo-transparent.png" alt="SnackBuddy logo" class="sb-logo" />
+        <img src="assets/logo-transparent.png" alt="SnackBuddy logo" class="sb-logo" width="32" height="32" />
         <span class="sb-nav-title">SnackBuddy</span>
       </div>
       <button class="sb-nav-close" aria-label="Close menu">&times;</button>
@@ -2898,7 +3081,7 @@ def build_page_html(deals):
     <header class="sb-header">
         <div class="sb-header-inner">
             <div class="sb-header-left">
-                <img src="assets/logo-transparent.png" alt="SnackBuddy logo" class="sb-logo" />
+                <img src="assets/logo-transparent.png" alt="SnackBuddy logo" class="sb-logo" width="32" height="32" />
                 <span class="sb-header-title">SnackBuddy</span>
             </div>
             <button class="sb-menu-button" aria-label="Menu" aria-expanded="false">☰</button>
@@ -2914,7 +3097,7 @@ def build_page_html(deals):
                 <div class="sb-hero-pattern"></div>
                 <div class="sb-hero-content">
                     <div class="sb-hero-kicker">
-                        SnackBuddy • Last updated: {last_updated} (local time)
+                        SnackBuddy • Last updated: ${last_updated} (local time)
                     </div>
                     <h1 class="sb-hero-title">Don&apos;t overpay for the snacks you already buy.</h1>
                     <div class="sb-hero-tiers" aria-label="Deal strength key">
@@ -2963,7 +3146,7 @@ def build_page_html(deals):
         <div class="sb-deals-shell">
         <div class="sb-deals-main">
         <section class="card-grid" id="deals-list">
-            {cards_html}
+            ${cards_html}
         </section>
 
         </div>
@@ -3040,7 +3223,7 @@ def build_page_html(deals):
                 </p>
 
                 <div class="sb-beehiiv-embed" id="sb-beehiiv-footer">
-                    {beehiiv_embed_script}
+                    ${beehiiv_embed_script}
                 </div>
 
                 <a class="sb-subscribe-alt"
@@ -3052,7 +3235,6 @@ def build_page_html(deals):
                     No spam. Unsubscribe anytime.
                 </div>
             </div>
-        </section>
     </main>
 
     <div class="sb-welcome" id="sb-welcome" hidden aria-hidden="true">
@@ -3155,11 +3337,14 @@ def build_page_html(deals):
         </p>
     </footer>
 
+    <!-- Filter values and per-card sort keys -->
+${page_data_script}
     <!-- Tiny JS for slide-out menu -->
 <script>
-document.addEventListener("DOMContentLoaded", function () {{
+document.addEventListener("DOMContentLoaded", function () {
   const grid = document.getElementById("deals-list");
-  const cards = Array.from(document.querySelectorAll(".card"));
+  /* Cards are the grid's only element children; no document-wide selector match */
+  const cards = grid ? Array.from(grid.children) : [];
 
   const filterBarInner = document.getElementById("sb-filter-bar-inner");
   const filterSheetBody = document.getElementById("sb-filter-sheet-body");
@@ -3185,53 +3370,45 @@ document.addEventListener("DOMContentLoaded", function () {{
   const navBackdrop = document.getElementById("sb-nav-backdrop");
   const navClose = document.querySelector(".sb-nav-close");
 
-  function openNav() {{
+  function openNav() {
     if (!navDrawer || !navBackdrop || !navBtn) return;
     navDrawer.classList.add("open");
     navBackdrop.classList.add("open");
     navBtn.setAttribute("aria-expanded", "true");
-  }}
+  }
 
-  function closeNav() {{
+  function closeNav() {
     if (!navDrawer || !navBackdrop || !navBtn) return;
     navDrawer.classList.remove("open");
     navBackdrop.classList.remove("open");
     navBtn.setAttribute("aria-expanded", "false");
-  }}
+  }
 
-  navBtn?.addEventListener("click", function() {{
+  navBtn?.addEventListener("click", function() {
     if (navDrawer?.classList.contains("open")) closeNav();
     else openNav();
-  }});
+  });
   navBackdrop?.addEventListener("click", closeNav);
   navClose?.addEventListener("click", closeNav);
 
   /* close nav when clicking nav links */
-  if (navDrawer) {{
+  if (navDrawer) {
     const navLinks = navDrawer.querySelectorAll("a.sb-nav-link");
-    navLinks.forEach(function(link) {{
+    navLinks.forEach(function(link) {
       link.addEventListener("click", closeNav);
-    }});
-  }}
+    });
+  }
 
   /* ============================
      FILTER BAR (Walmart-style pills)
      ============================ */
-  if (!grid || !cards.length || !filterBarInner) {{
+  if (!grid || !cards.length || !filterBarInner) {
     return;
-  }}
-
-  cards.forEach(function(card, idx) {{
-    card.dataset.originalIndex = String(idx);
-  }});
+  }
 
-  function uniq(values) {{
-    return Array.from(new Set(values.filter(Boolean))).sort();
-  }}
-
-  function titleize(s) {{
+  function titleize(s) {
     if (!s) return "";
-    const specialCases = {{
+    const specialCases = {
       "rtd": "RTD",
       "protein": "Protein",
       "drink": "Drink",
@@ -3243,118 +3420,230 @@ document.addEventListener("DOMContentLoaded", function () {{
       "cookies": "Cookies",
       "meat": "Meat",
       "energy": "Energy"
-    }};
+    };
     const parts = s.split(/([\\s&\\-])/);
-    return parts.map(function(part) {{
-      if (part.match(/^[\\s&\\-]$/)) return part;
+    return parts.map(function(part) {
+      if (part.match(/^[\\s&\\-]$$/)) return part;
       const lower = part.toLowerCase();
       if (specialCases[lower]) return specialCases[lower];
       return part.charAt(0).toUpperCase() + part.slice(1).toLowerCase();
-    }}).join("");
-  }}
+    }).join("");
+  }
 
   const FILTER_DEFS = [
-    {{ key: "retailer", label: "Retailer" }},
-    {{ key: "section", label: "Section" }},
-    {{ key: "category", label: "Category" }},
-    {{ key: "brand", label: "Brand" }},
+    { key: "retailer", label: "Retailer" },
+    { key: "section", label: "Section" },
+    { key: "category", label: "Category" },
+    { key: "brand", label: "Brand" },
   ];
 
-  const selected = {{
+  const selected = {
     retailer: new Set(),
     section: new Set(),
     category: new Set(),
     brand: new Set(),
-  }};
-
-  const pillWraps = {{}};
+  };
+
+  /* Numeric sort keys come pre-parsed from the page (see write_page) */
+  const SORT_PRICE = window.__SB_PRICES;
+  const SORT_PCT = window.__SB_PCT;
+  const SORT_TIER = window.__SB_TIER;
+
+  /* Every value of each filter key, sorted. Cards carry indexes into these
+     lists, and the x-<key>-<i> hide rules in the inline <style> use the same
+     numbering. */
+  const FACETS = window.__SB_FACETS || {};
+  const NO_VALUES = [];
+
+  /* Each card's filter codes (indexes into FACETS), read from the dataset once
+     into one typed array per key. Filtering and sorting then work on card
+     indexes and only the final show/hide + reorder touches the DOM. Cards
+     arrive in page order, so a card's position is its index into these and
+     the __SB_* sort-key arrays. */
+  const N = cards.length;
+  const CARD_CODES = {};
+  FILTER_DEFS.forEach(function(def) {
+    const codes = new Uint16Array(N);
+    for (let i = 0; i < N; i++) {
+      codes[i] = parseInt(cards[i].dataset[def.key], 10) || 0;
+    }
+    CARD_CODES[def.key] = codes;
+  });
+
+  /* Each card's place in the deal order (tier, then % off, then price),
+     ranked once at load. Re-sorting a filtered subset is then a single
+     integer compare per pair instead of walking three keys. */
+  function compareSortKeys(a, b) {
+    if (SORT_TIER[a] !== SORT_TIER[b]) return SORT_TIER[b] - SORT_TIER[a];
+    if (SORT_PCT[a] !== SORT_PCT[b]) return SORT_PCT[b] - SORT_PCT[a];
+    return SORT_PRICE[a] - SORT_PRICE[b];
+  }
+
+  const SORT_RANK = new Int32Array(N);
+  let inPageOrder = true;
+  const rankedOrder = cards.map(function(card, i) { return i; }).sort(compareSortKeys);
+  for (let rank = 0; rank < N; rank++) {
+    const i = rankedOrder[rank];
+    SORT_RANK[i] = rank;
+    if (i !== rank) inPageOrder = false;
+  }
+
+  function compareRank(a, b) {
+    return SORT_RANK[a] - SORT_RANK[b];
+  }
+
+  function facetValues(key) {
+    return (FACETS[key] || []).filter(Boolean);
+  }
+
+  /* Pill elements by filter key, kept from buildFilterBar so updates never re-query */
+  const pillWraps = {};
+  const pillButtons = {};
+  const pillBadges = {};
   let openDropdownKey = null;
-
-  function cardMatchesSelected(card, excludeKey) {{
-    const r = card.dataset.retailer;
-    const s = card.dataset.section;
-    const c = card.dataset.category;
-    const b = card.dataset.brand;
-
-    if (excludeKey !== "retailer" && selected.retailer.size > 0 && !selected.retailer.has(r)) return false;
-    if (excludeKey !== "section" && selected.section.size > 0 && !selected.section.has(s)) return false;
-    if (excludeKey !== "category" && selected.category.size > 0 && !selected.category.has(c)) return false;
-    if (excludeKey !== "brand" && selected.brand.size > 0 && !selected.brand.has(b)) return false;
+  let pendingFrame = 0;
+  /* Card indexes in their current DOM order, so unchanged orderings skip the reorder */
+  let domOrder = new Int32Array(N);
+  for (let i = 0; i < N; i++) domOrder[i] = i;
+
+  function visibleOrderMatches(shown, isShown) {
+    let k = 0;
+    for (let j = 0; j < N; j++) {
+      const i = domOrder[j];
+      if (isShown[i] && i !== shown[k++]) return false;
+    }
     return true;
-  }}
-
-  function getSmartOptionsForKey(key) {{
-    const matching = cards.filter(function(card) {{ return cardMatchesSelected(card, key); }});
-
-    return uniq(matching.map(function(card) {{ return card.dataset[key]; }})).map(function(v) {{
-      return {{ value: v, label: titleize(v) }};
-    }});
-  }}
-
-  function pruneInvalidSelections() {{
-    FILTER_DEFS.forEach(function(def) {{
-      const available = new Set(getSmartOptionsForKey(def.key).map(function(opt) {{ return opt.value; }}));
-      Array.from(selected[def.key]).forEach(function(val) {{
+  }
+
+  /* The selection for one key as a lookup by facet code, or null when
+     nothing is selected and every card passes. */
+  function selectionMask(key) {
+    const sel = selected[key];
+    if (sel.size === 0) return null;
+    const values = FACETS[key] || NO_VALUES;
+    const mask = new Uint8Array(values.length);
+    values.forEach(function(v, code) {
+      if (sel.has(v)) mask[code] = 1;
+    });
+    return mask;
+  }
+
+  /* Matching card indexes by selection signature. One filter change asks for
+     the same sets several times (pruning, the count, the option lists), and
+     toggling a value back returns to a signature already seen. Cached arrays
+     are shared, so callers must not modify them. */
+  const matchCache = new Map();
+  const MATCH_CACHE_MAX = 64;
+
+  function selectionSignature(excludeKey) {
+    return JSON.stringify(FILTER_DEFS.map(function(def) {
+      return def.key === excludeKey ? null : Array.from(selected[def.key]).sort();
+    }));
+  }
+
+  /* Indexes of the cards passing every selected filter except excludeKey,
+     ascending, as an Int32Array: sorting it compares plain integers from
+     typed-array loads rather than element references. */
+  function matchingIndexes(excludeKey) {
+    const sig = selectionSignature(excludeKey);
+    const hit = matchCache.get(sig);
+    if (hit) return hit;
+    const tests = [];
+    FILTER_DEFS.forEach(function(def) {
+      if (def.key === excludeKey) return;
+      const mask = selectionMask(def.key);
+      if (mask) tests.push({ codes: CARD_CODES[def.key], mask: mask });
+    });
+    const buf = new Int32Array(N);
+    let count = 0;
+    const nTests = tests.length;
+    for (let i = 0; i < N; i++) {
+      let t = 0;
+      while (t < nTests && tests[t].mask[tests[t].codes[i]] === 1) t++;
+      if (t === nTests) buf[count++] = i;
+    }
+    const out = buf.slice(0, count);
+    if (matchCache.size >= MATCH_CACHE_MAX) matchCache.clear();
+    matchCache.set(sig, out);
+    return out;
+  }
+
+  function getSmartOptionsForKey(key) {
+    const values = FACETS[key] || NO_VALUES;
+    const codes = CARD_CODES[key];
+    const present = new Uint8Array(values.length);
+    const matches = matchingIndexes(key);
+    for (let j = 0, n = matches.length; j < n; j++) present[codes[matches[j]]] = 1;
+
+    const options = [];
+    values.forEach(function(v, code) {
+      if (v && present[code]) options.push({ value: v, label: titleize(v) });
+    });
+    return options;
+  }
+
+  function pruneInvalidSelections() {
+    FILTER_DEFS.forEach(function(def) {
+      const available = new Set(getSmartOptionsForKey(def.key).map(function(opt) { return opt.value; }));
+      Array.from(selected[def.key]).forEach(function(val) {
         if (!available.has(val)) selected[def.key].delete(val);
-      }});
-    }});
-  }}
+      });
+    });
+  }
 
-  function totalSelectedCount() {{
+  function totalSelectedCount() {
     return selected.retailer.size + selected.section.size
       + selected.category.size + selected.brand.size;
-  }}
+  }
+
+  /* Count and badge writes skip the DOM when the value is unchanged */
+  function setText(el, text) {
+    if (el.textContent !== text) el.textContent = text;
+  }
+
+  function setHidden(el, hidden) {
+    if (el.hidden !== hidden) el.hidden = hidden;
+  }
 
-  function updateBadges() {{
-    FILTER_DEFS.forEach(function(def) {{
-      const wrap = pillWraps[def.key];
-      if (!wrap) return;
-      const badge = wrap.querySelector(".sb-filter-pill-badge");
+  function updateBadges() {
+    FILTER_DEFS.forEach(function(def) {
+      const badge = pillBadges[def.key];
       const n = selected[def.key].size;
       if (!badge) return;
-      if (n > 0) {{
-        badge.textContent = String(n);
-        badge.hidden = false;
-      }} else {{
-        badge.hidden = true;
-      }}
-    }});
+      if (n > 0) setText(badge, String(n));
+      setHidden(badge, n === 0);
+    });
     const total = totalSelectedCount();
-    if (filterMasterCount) {{
-      if (total > 0) {{
-        filterMasterCount.textContent = String(total);
-        filterMasterCount.hidden = false;
-      }} else {{
-        filterMasterCount.hidden = true;
-      }}
-    }}
-  }}
-
-  function syncCheckboxes(key) {{
-    document.querySelectorAll('input[data-filter-key="' + key + '"]').forEach(function(cb) {{
-      cb.checked = selected[key].has(cb.value);
-    }});
-  }}
-
-  function syncAllCheckboxes() {{
-    FILTER_DEFS.forEach(function(def) {{ syncCheckboxes(def.key); }});
-  }}
-
-  function closeAllDropdowns() {{
+    if (filterMasterCount) {
+      if (total > 0) setText(filterMasterCount, String(total));
+      setHidden(filterMasterCount, total === 0);
+    }
+  }
+
+  /* One query for every filter checkbox on the page; only boxes whose state
+     actually changed are written. */
+  function syncAllCheckboxes() {
+    document.querySelectorAll("input[data-filter-key]").forEach(function(cb) {
+      const sel = selected[cb.dataset.filterKey];
+      const want = !!sel && sel.has(cb.value);
+      if (cb.checked !== want) cb.checked = want;
+    });
+  }
+
+  function closeAllDropdowns() {
     openDropdownKey = null;
-    Object.keys(pillWraps).forEach(function(k) {{
+    Object.keys(pillWraps).forEach(function(k) {
       pillWraps[k].classList.remove("is-open");
-      const btn = pillWraps[k].querySelector(".sb-filter-pill");
-      if (btn) btn.setAttribute("aria-expanded", "false");
-    }});
-    if (filterDropdownPanel) {{
+      pillButtons[k].setAttribute("aria-expanded", "false");
+    });
+    if (filterDropdownPanel) {
       filterDropdownPanel.hidden = true;
       filterDropdownPanel.innerHTML = "";
-    }}
+    }
     filterDropdownBackdrop?.classList.remove("open");
-  }}
+  }
 
-  function positionDropdownPanel(anchorBtn) {{
+  function positionDropdownPanel(anchorBtn) {
     if (!filterDropdownPanel || !anchorBtn) return;
     filterDropdownPanel.hidden = false;
     const rect = anchorBtn.getBoundingClientRect();
@@ -3363,97 +3652,97 @@ document.addEventListener("DOMContentLoaded", function () {{
     let left = rect.left;
     let top = rect.bottom + 6;
     left = Math.max(8, Math.min(left, window.innerWidth - panelWidth - 8));
-    if (top + panelHeight > window.innerHeight - 8) {{
+    if (top + panelHeight > window.innerHeight - 8) {
       top = Math.max(8, rect.top - panelHeight - 6);
-    }}
+    }
     filterDropdownPanel.style.left = left + "px";
     filterDropdownPanel.style.top = top + "px";
-  }}
+  }
 
-  function openDropdown(key) {{
+  function openDropdown(key) {
     closeAllDropdowns();
     const wrap = pillWraps[key];
-    if (!wrap || !filterDropdownPanel) return;
-    const btn = wrap.querySelector(".sb-filter-pill");
-    if (!btn) return;
+    const btn = pillButtons[key];
+    if (!wrap || !btn || !filterDropdownPanel) return;
 
     openDropdownKey = key;
     wrap.classList.add("is-open");
     btn.setAttribute("aria-expanded", "true");
     buildCheckboxList(filterDropdownPanel, key);
-    const def = FILTER_DEFS.find(function(d) {{ return d.key === key; }});
+    const def = FILTER_DEFS.find(function(d) { return d.key === key; });
     filterDropdownPanel.setAttribute("aria-label", (def ? def.label : "Filter") + " options");
     positionDropdownPanel(btn);
     filterDropdownBackdrop?.classList.add("open");
-  }}
+  }
 
-  function openFilterSheet() {{
+  function openFilterSheet() {
     filterSheet?.classList.add("open");
     filterSheetBackdrop?.classList.add("open");
     filterMasterBtn?.setAttribute("aria-expanded", "true");
     closeAllDropdowns();
-  }}
+  }
 
-  function closeFilterSheet() {{
+  function closeFilterSheet() {
     filterSheet?.classList.remove("open");
     filterSheetBackdrop?.classList.remove("open");
     filterMasterBtn?.setAttribute("aria-expanded", "false");
-  }}
+  }
 
-  function onFilterChange(key, value, checked) {{
+  function onFilterChange(key, value, checked) {
     if (checked) selected[key].add(value);
     else selected[key].delete(value);
-    pruneInvalidSelections();
-    syncAllCheckboxes();
-    updateBadges();
     applyFiltersAndSort();
-    refreshFilterOptionLists();
-  }}
+  }
+
+  const HTML_ESCAPES = { "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;" };
+
+  function escapeHtml(s) {
+    return String(s).replace(/[&<>"']/g, function(ch) { return HTML_ESCAPES[ch]; });
+  }
 
-  function buildCheckboxList(container, key) {{
-    container.innerHTML = "";
+  /* Option lists are rebuilt on every filter change, so they are produced as
+     one HTML string and parsed in a single innerHTML write. */
+  function checkboxListHtml(key) {
     const options = getSmartOptionsForKey(key);
-    if (!options.length) {{
-      const empty = document.createElement("div");
-      empty.className = "sb-filter-dropdown-empty";
-      empty.textContent = "No options match your current filters.";
-      container.appendChild(empty);
-      return;
-    }}
-    options.forEach(function(opt) {{
-      const label = document.createElement("label");
-      label.className = "sb-filter-check";
-      const cb = document.createElement("input");
-      cb.type = "checkbox";
-      cb.value = opt.value;
-      cb.dataset.filterKey = key;
-      cb.checked = selected[key].has(opt.value);
-      cb.addEventListener("change", function() {{
-        onFilterChange(key, opt.value, cb.checked);
-      }});
-      const span = document.createElement("span");
-      span.textContent = opt.label;
-      label.appendChild(cb);
-      label.appendChild(span);
-      container.appendChild(label);
-    }});
-  }}
-
-  function refreshFilterOptionLists() {{
-    if (filterSheet?.classList.contains("open")) {{
+    if (!options.length) {
+      return '<div class="sb-filter-dropdown-empty">No options match your current filters.</div>';
+    }
+    const keyAttr = escapeHtml(key);
+    return options.map(function(opt) {
+      return '<label class="sb-filter-check"><input type="checkbox" value="' + escapeHtml(opt.value)
+        + '" data-filter-key="' + keyAttr + '"' + (selected[key].has(opt.value) ? " checked" : "")
+        + "><span>" + escapeHtml(opt.label) + "</span></label>";
+    }).join("");
+  }
+
+  function buildCheckboxList(container, key) {
+    container.innerHTML = checkboxListHtml(key);
+  }
+
+  /* One change listener per list container; checkboxes carry their key and value */
+  function onCheckboxListChange(e) {
+    const cb = e.target;
+    if (!cb || !cb.dataset || !cb.dataset.filterKey) return;
+    onFilterChange(cb.dataset.filterKey, cb.value, cb.checked);
+  }
+
+  filterDropdownPanel?.addEventListener("change", onCheckboxListChange);
+  filterSheetBody?.addEventListener("change", onCheckboxListChange);
+
+  function refreshFilterOptionLists() {
+    if (filterSheet?.classList.contains("open")) {
       buildFilterSheet();
-    }}
-    if (openDropdownKey && filterDropdownPanel && !filterDropdownPanel.hidden) {{
-      const wrap = pillWraps[openDropdownKey];
-      const btn = wrap?.querySelector(".sb-filter-pill");
+    }
+    if (openDropdownKey && filterDropdownPanel && !filterDropdownPanel.hidden) {
+      const btn = pillButtons[openDropdownKey];
       buildCheckboxList(filterDropdownPanel, openDropdownKey);
       if (btn) positionDropdownPanel(btn);
-    }}
-  }}
+    }
+  }
 
-  function buildFilterBar() {{
-    filterBarInner.innerHTML = "";
-    FILTER_DEFS.forEach(function(def) {{
+  function buildFilterBar() {
+    const frag = document.createDocumentFragment();
+    FILTER_DEFS.forEach(function(def) {
       const wrap = document.createElement("div");
       wrap.className = "sb-filter-pill-wrap";
       wrap.dataset.filterKey = def.key;
@@ -3469,36 +3758,31 @@ document.addEventListener("DOMContentLoaded", function () {{
       badge.hidden = true;
       btn.appendChild(badge);
 
-      btn.addEventListener("click", function(e) {{
+      btn.addEventListener("click", function(e) {
         e.stopPropagation();
         if (wrap.classList.contains("is-open")) closeAllDropdowns();
         else openDropdown(def.key);
-      }});
+      });
 
       wrap.appendChild(btn);
-      filterBarInner.appendChild(wrap);
+      frag.appendChild(wrap);
       pillWraps[def.key] = wrap;
-    }});
-  }}
+      pillButtons[def.key] = btn;
+      pillBadges[def.key] = badge;
+    });
+    filterBarInner.innerHTML = "";
+    filterBarInner.appendChild(frag);
+  }
 
-  function buildFilterSheet() {{
+  function buildFilterSheet() {
     if (!filterSheetBody) return;
-    filterSheetBody.innerHTML = "";
-    FILTER_DEFS.forEach(function(def) {{
-      const group = document.createElement("div");
-      group.className = "sb-filter-sheet-group";
-      const title = document.createElement("div");
-      title.className = "sb-filter-sheet-group-title";
-      title.textContent = def.label;
-      const body = document.createElement("div");
-      buildCheckboxList(body, def.key);
-      group.appendChild(title);
-      group.appendChild(body);
-      filterSheetBody.appendChild(group);
-    }});
-  }}
-
-  function updateScrollButtons() {{
+    filterSheetBody.innerHTML = FILTER_DEFS.map(function(def) {
+      return '<div class="sb-filter-sheet-group"><div class="sb-filter-sheet-group-title">'
+        + escapeHtml(def.label) + "</div><div>" + checkboxListHtml(def.key) + "</div></div>";
+    }).join("");
+  }
+
+  function updateScrollButtons() {
     if (!filterTrack || !filterScrollPrev || !filterScrollNext) return;
     const maxScroll = filterTrack.scrollWidth - filterTrack.clientWidth;
     const show = maxScroll > 4;
@@ -3508,146 +3792,151 @@ document.addEventListener("DOMContentLoaded", function () {{
     filterScrollNext.classList.toggle("is-visible", hasNext);
     filterBarScroll?.classList.toggle("has-scroll-prev", hasPrev);
     filterBarScroll?.classList.toggle("has-scroll-next", hasNext);
-  }}
-
-  function applyFiltersAndSort() {{
+  }
+
+  /* Filter changes only mark the view dirty; every change made before the next
+     frame (several chip clicks, a clear, welcome prefs) folds into one
+     renderFilteredView pass there. */
+  function applyFiltersAndSort() {
+    if (pendingFrame) return;
+    pendingFrame = requestAnimationFrame(function() {
+      pendingFrame = 0;
+      renderFilteredView();
+    });
+  }
+
+  /* Read phase: prunes the selection and works out what the grid should
+     show, touching nothing in the DOM. */
+  function computeFilteredView() {
     pruneInvalidSelections();
-    const selR = selected.retailer;
-    const selS = selected.section;
-    const selC = selected.category;
-    const selB = selected.brand;
-    let shown = [];
-
-    cards.forEach(function(card) {{
-      const r = card.dataset.retailer;
-      const s = card.dataset.section;
-      const c = card.dataset.category;
-      const b = card.dataset.brand;
-
-      const matchR = selR.size === 0 || selR.has(r);
-      const matchS = selS.size === 0 || selS.has(s);
-      const matchC = selC.size === 0 || selC.has(c);
-      const matchB = selB.size === 0 || selB.has(b);
-
-      if (matchR && matchS && matchC && matchB) {{
-        card.style.display = "";
-        shown.push(card);
-      }} else {{
-        card.style.display = "none";
-      }}
-    }});
-
-    shown.sort(function(a, b) {{
-      const aPrice = parseFloat(a.dataset.price || "0");
-      const bPrice = parseFloat(b.dataset.price || "0");
-      const aPct = parseFloat(a.dataset.percent || "0");
-      const bPct = parseFloat(b.dataset.percent || "0");
-      const aTier = a.dataset.tier || "sale";
-      const bTier = b.dataset.tier || "sale";
-
-      function getTierPriority(tier) {{
-        if (tier === "diamond") return 4;
-        if (tier === "fire") return 3;
-        if (tier === "strong") return 2;
-        return 1;
-      }}
-
-      const aTierPriority = getTierPriority(aTier);
-      const bTierPriority = getTierPriority(bTier);
-      if (aTierPriority !== bTierPriority) return bTierPriority - aTierPriority;
-      if (aPct !== bPct) return bPct - aPct;
-      return aPrice - bPrice;
-    }});
-
-    shown.forEach(function(card) {{ grid.appendChild(card); }});
-  }}
-
-  function clearAllFilters() {{
-    selected.retailer.clear();
-    selected.section.clear();
-    selected.category.clear();
-    selected.brand.clear();
+    const shown = matchingIndexes(null).slice();
+
+    /* Hiding is done by the generated CSS rules: one class per unselected value */
+    let gridClass = "card-grid";
+    FILTER_DEFS.forEach(function(def) {
+      const sel = selected[def.key];
+      if (sel.size === 0) return;
+      (FACETS[def.key] || []).forEach(function(value, i) {
+        if (!sel.has(value)) gridClass += " x-" + def.key + "-" + i;
+      });
+    });
+
+    /* write_page emits cards already in deal order, so the ascending
+       indexes from matchingIndexes normally need no sort at all */
+    if (!inPageOrder) shown.sort(compareRank);
+    return { shown: shown, gridClass: gridClass };
+  }
+
+  /* Checkboxes, badges and the open option list. The dropdown's position is
+     the one layout read, and it runs before the grid is dirtied. */
+  function writeFilterControls() {
     syncAllCheckboxes();
     updateBadges();
-    applyFiltersAndSort();
     refreshFilterOptionLists();
-  }}
+  }
+
+  function writeGrid(view) {
+    const shown = view.shown;
+    if (grid.className !== view.gridClass) grid.className = view.gridClass;
+    const nShown = shown.length;
+    const isShown = new Uint8Array(N);
+    for (let j = 0; j < nShown; j++) isShown[shown[j]] = 1;
+    if (visibleOrderMatches(shown, isShown)) return;
+    /* Take the grid out of the document while its cards move, so none of
+       the moves touch live layout, then put it back in one insert. Skipped
+       when focus is inside the grid, since removal would drop it. */
+    const parent = grid.parentNode;
+    const next = grid.nextSibling;
+    const detach = parent && !grid.contains(document.activeElement);
+    if (detach) parent.removeChild(grid);
+    const frag = document.createDocumentFragment();
+    for (let j = 0; j < nShown; j++) frag.appendChild(cards[shown[j]]);
+    grid.appendChild(frag);
+    if (detach) parent.insertBefore(grid, next);
+    /* Hidden cards keep their places ahead of the shown ones */
+    const nextOrder = new Int32Array(N);
+    let k = 0;
+    for (let j = 0; j < N; j++) {
+      if (!isShown[domOrder[j]]) nextOrder[k++] = domOrder[j];
+    }
+    nextOrder.set(shown, k);
+    domOrder = nextOrder;
+  }
+
+  /* All reads first, then writes: the controls (which end with the only
+     layout read), then the grid, so that read never has to lay out a grid
+     that was just changed. */
+  function renderFilteredView() {
+    const view = computeFilteredView();
+    writeFilterControls();
+    writeGrid(view);
+  }
+
+  function clearAllFilters() {
+    FILTER_DEFS.forEach(function(def) { selected[def.key].clear(); });
+    applyFiltersAndSort();
+  }
 
+  /* No initial applyFiltersAndSort: the page arrives in deal order with
+     nothing selected, which is exactly what it would render. */
   buildFilterBar();
   buildFilterSheet();
-  updateBadges();
-  applyFiltersAndSort();
 
   /* ============================
      WELCOME PREFS + BEEHIIV EMBED
      ============================ */
-  const BEEHIIV_FORM_ID = "{beehiiv_form_id}";
-  const BEEHIIV_PUBLICATION_ID = "{beehiiv_pub_id}";
+  const BEEHIIV_FORM_ID = "${beehiiv_form_id}";
+  const BEEHIIV_PUBLICATION_ID = "${beehiiv_pub_id}";
   const WELCOME_STORAGE_KEY = "sb_welcome_v2";
   const RETAILER_ORDER = ["walmart", "target", "kroger", "harris teeter", "meijer"];
 
-  function countMatchingCards() {{
-    let n = 0;
-    cards.forEach(function(card) {{
-      const r = card.dataset.retailer;
-      const s = card.dataset.section;
-      const c = card.dataset.category;
-      const b = card.dataset.brand;
-      const matchR = selected.retailer.size === 0 || selected.retailer.has(r);
-      const matchS = selected.section.size === 0 || selected.section.has(s);
-      const matchC = selected.category.size === 0 || selected.category.has(c);
-      const matchB = selected.brand.size === 0 || selected.brand.has(b);
-      if (matchR && matchS && matchC && matchB) n += 1;
-    }});
-    return n;
-  }}
-
-  function applyWelcomePrefs(prefs) {{
+  function countMatchingCards() {
+    return matchingIndexes(null).length;
+  }
+
+  function applyWelcomePrefs(prefs) {
     selected.retailer.clear();
     selected.section.clear();
     selected.category.clear();
     selected.brand.clear();
-    (prefs.retailers || []).forEach(function(v) {{ if (v) selected.retailer.add(v); }});
-    (prefs.categories || []).forEach(function(v) {{ if (v) selected.category.add(v); }});
-    syncAllCheckboxes();
-    updateBadges();
+    (prefs.retailers || []).forEach(function(v) { if (v) selected.retailer.add(v); });
+    (prefs.categories || []).forEach(function(v) { if (v) selected.category.add(v); });
     applyFiltersAndSort();
-    refreshFilterOptionLists();
-  }}
+  }
 
-  function saveWelcomePrefs(prefs) {{
-    try {{
+  function saveWelcomePrefs(prefs) {
+    try {
       localStorage.setItem(WELCOME_STORAGE_KEY, JSON.stringify(prefs));
-    }} catch (err) {{}}
-  }}
+    } catch (err) {}
+  }
 
-  function loadWelcomePrefs() {{
-    try {{
+  function loadWelcomePrefs() {
+    try {
       const raw = localStorage.getItem(WELCOME_STORAGE_KEY);
       if (!raw) return null;
       return JSON.parse(raw);
-    }} catch (err) {{
+    } catch (err) {
       return null;
-    }}
-  }}
+    }
+  }
 
-  function isValidEmail(value) {{
-    return /^[^\\s@]+@[^\\s@]+\\.[^\\s@]+$/.test(String(value || "").trim());
-  }}
+  function isValidEmail(value) {
+    return /^[^\\s@]+@[^\\s@]+\\.[^\\s@]+$$/.test(String(value || "").trim());
+  }
 
-  function submitWelcomeEmail(email) {{
+  function submitWelcomeEmail(email) {
     // Hidden-iframe POST to beehiiv's public subscribe endpoint (same family as
     // their embed). We can't read the cross-origin response; friend tests /
     // Audience list confirm delivery.
-    if (!BEEHIIV_PUBLICATION_ID) {{
+    if (!BEEHIIV_PUBLICATION_ID) {
       return Promise.reject(new Error("missing publication id"));
-    }}
-    return new Promise(function(resolve, reject) {{
+    }
+    return new Promise(function(resolve, reject) {
       const frame = document.getElementById("sb-welcome-signup-frame");
-      if (!frame) {{
+      if (!frame) {
         reject(new Error("missing frame"));
         return;
-      }}
+      }
 
       const form = document.createElement("form");
       form.method = "POST";
@@ -3655,13 +3944,13 @@ document.addEventListener("DOMContentLoaded", function () {{
       form.action = "https://subscribe-forms.beehiiv.com/" + encodeURIComponent(BEEHIIV_PUBLICATION_ID) + "/submissions";
       form.style.display = "none";
 
-      function addField(name, value) {{
+      function addField(name, value) {
         const input = document.createElement("input");
         input.type = "hidden";
         input.name = name;
         input.value = value;
         form.appendChild(input);
-      }}
+      }
       addField("email", email);
       addField("reactivate_existing", "true");
       addField("send_welcome_email", "true");
@@ -3669,35 +3958,35 @@ document.addEventListener("DOMContentLoaded", function () {{
       if (BEEHIIV_FORM_ID) addField("form_id", BEEHIIV_FORM_ID);
 
       let settled = false;
-      function done(ok) {{
+      function done(ok) {
         if (settled) return;
         settled = true;
-        try {{ form.remove(); }} catch (err) {{}}
+        try { form.remove(); } catch (err) {}
         if (ok) resolve();
         else reject(new Error("subscribe failed"));
-      }}
+      }
 
-      frame.onload = function() {{ done(true); }};
+      frame.onload = function() { done(true); };
       document.body.appendChild(form);
-      try {{
+      try {
         form.submit();
-      }} catch (err) {{
+      } catch (err) {
         done(false);
         return;
-      }}
-      window.setTimeout(function() {{ done(true); }}, 1200);
-    }});
-  }}
+      }
+      window.setTimeout(function() { done(true); }, 1200);
+    });
+  }
 
-  function initWelcomeFlow() {{
+  function initWelcomeFlow() {
     const root = document.getElementById("sb-welcome");
     if (!root) return;
 
     const existing = loadWelcomePrefs();
-    if (existing && existing.completed) {{
+    if (existing && existing.completed) {
       applyWelcomePrefs(existing);
       return;
-    }}
+    }
 
     const retailerBox = document.getElementById("sb-welcome-retailers");
     const categoryBox = document.getElementById("sb-welcome-categories");
@@ -3712,74 +4001,74 @@ document.addEventListener("DOMContentLoaded", function () {{
     const dots = Array.from(root.querySelectorAll(".sb-welcome-dot"));
     const steps = Array.from(root.querySelectorAll(".sb-welcome-step"));
 
-    const draft = {{
+    const draft = {
       retailers: new Set(),
       categories: new Set(),
       otherOn: false,
       otherStore: "",
       email: "",
       subscribed: false,
-    }};
+    };
 
     let step = 0;
 
-    function getOtherStore() {{
+    function getOtherStore() {
       if (!draft.otherOn) return "";
       const typed = otherInput ? String(otherInput.value || "").trim() : draft.otherStore;
       draft.otherStore = typed;
       return typed;
-    }}
+    }
 
-    function availableRetailers() {{
-      const present = uniq(cards.map(function(c) {{ return c.dataset.retailer; }}));
-      const ordered = RETAILER_ORDER.filter(function(r) {{ return present.indexOf(r) !== -1; }});
-      present.forEach(function(r) {{
+    function availableRetailers() {
+      const present = facetValues("retailer");
+      const ordered = RETAILER_ORDER.filter(function(r) { return present.indexOf(r) !== -1; });
+      present.forEach(function(r) {
         if (ordered.indexOf(r) === -1) ordered.push(r);
-      }});
+      });
       return ordered;
-    }}
+    }
 
-    function setEmailStatus(msg, isError) {{
+    function setEmailStatus(msg, isError) {
       if (!welcomeEmailStatus) return;
       welcomeEmailStatus.textContent = msg || "";
       welcomeEmailStatus.classList.toggle("is-error", !!isError);
-    }}
+    }
 
-    function wireWelcomeSignup() {{
+    function wireWelcomeSignup() {
       if (!welcomeSignup || welcomeSignup.dataset.wired === "1") return;
       welcomeSignup.dataset.wired = "1";
-      welcomeSignup.addEventListener("submit", function(ev) {{
+      welcomeSignup.addEventListener("submit", function(ev) {
         ev.preventDefault();
-        if (draft.subscribed) {{
+        if (draft.subscribed) {
           setEmailStatus("You’re already on the list.");
           return;
-        }}
+        }
         const email = welcomeEmail ? String(welcomeEmail.value || "").trim() : "";
-        if (!isValidEmail(email)) {{
+        if (!isValidEmail(email)) {
           setEmailStatus("Enter a valid email address.", true);
           if (welcomeEmail) welcomeEmail.focus();
           return;
-        }}
-        if (!BEEHIIV_PUBLICATION_ID) {{
+        }
+        if (!BEEHIIV_PUBLICATION_ID) {
           setEmailStatus("Signup is temporarily unavailable. Try the footer form.", true);
           return;
-        }}
+        }
         if (welcomeEmailSubmit) welcomeEmailSubmit.disabled = true;
         setEmailStatus("Subscribing…");
         draft.email = email;
-        submitWelcomeEmail(email).then(function() {{
+        submitWelcomeEmail(email).then(function() {
           draft.subscribed = true;
           setEmailStatus("You’re in — watch for a welcome email from SnackBuddy.");
           if (welcomeEmail) welcomeEmail.blur();
-        }}).catch(function() {{
+        }).catch(function() {
           setEmailStatus("Couldn’t subscribe. Try again or use the footer form.", true);
           if (welcomeEmailSubmit) welcomeEmailSubmit.disabled = false;
-        }});
-      }});
-    }}
+        });
+      });
+    }
 
-    function availableCategories() {{
-      const present = uniq(cards.map(function(c) {{ return c.dataset.category; }}));
+    function availableCategories() {
+      const present = facetValues("category");
       const preferred = [
         "bars",
         "chips & crunchy",
@@ -3790,136 +4079,134 @@ document.addEventListener("DOMContentLoaded", function () {{
         "rtd protein shake",
         "protein powder",
       ];
-      const ordered = preferred.filter(function(c) {{ return present.indexOf(c) !== -1; }});
-      present.forEach(function(c) {{
+      const ordered = preferred.filter(function(c) { return present.indexOf(c) !== -1; });
+      present.forEach(function(c) {
         if (ordered.indexOf(c) === -1) ordered.push(c);
-      }});
+      });
       return ordered;
-    }}
+    }
 
-    function syncOtherUi() {{
+    function syncOtherUi() {
       if (otherWrap) otherWrap.hidden = !draft.otherOn;
-      if (draft.otherOn && otherInput) {{
-        window.setTimeout(function() {{ otherInput.focus(); }}, 50);
-      }}
-    }}
-
-    function renderRetailerChips() {{
+      if (draft.otherOn && otherInput) {
+        window.setTimeout(function() { otherInput.focus(); }, 50);
+      }
+    }
+
+    function chipsHtml(values, setRef) {
+      return values.map(function(val) {
+        return '<button type="button" class="sb-welcome-chip' + (setRef.has(val) ? " is-on" : "")
+          + '" data-value="' + escapeHtml(val) + '">' + escapeHtml(titleize(val)) + "</button>";
+      }).join("");
+    }
+
+    function renderRetailerChips() {
       if (!retailerBox) return;
-      retailerBox.innerHTML = "";
-      availableRetailers().forEach(function(val) {{
-        const btn = document.createElement("button");
-        btn.type = "button";
-        btn.className = "sb-welcome-chip" + (draft.retailers.has(val) ? " is-on" : "");
-        btn.textContent = titleize(val);
-        btn.addEventListener("click", function() {{
-          if (draft.retailers.has(val)) draft.retailers.delete(val);
-          else draft.retailers.add(val);
-          btn.classList.toggle("is-on", draft.retailers.has(val));
-          updateLivePreview();
-        }});
-        retailerBox.appendChild(btn);
-      }});
-      const otherBtn = document.createElement("button");
-      otherBtn.type = "button";
-      otherBtn.className = "sb-welcome-chip" + (draft.otherOn ? " is-on" : "");
-      otherBtn.textContent = "Other";
-      otherBtn.addEventListener("click", function() {{
+      retailerBox.innerHTML = chipsHtml(availableRetailers(), draft.retailers)
+        + '<button type="button" class="sb-welcome-chip' + (draft.otherOn ? " is-on" : "")
+        + '" data-welcome-other="true">Other</button>';
+      syncOtherUi();
+    }
+
+    function renderChips(container, values, setRef) {
+      if (!container) return;
+      container.innerHTML = chipsHtml(values, setRef);
+    }
+
+    /* Chips are rebuilt on every visit to a step, so each box gets one
+       delegated click listener instead of one per chip. */
+    function toggleChip(btn, setRef) {
+      const val = btn.dataset.value;
+      if (setRef.has(val)) setRef.delete(val);
+      else setRef.add(val);
+      btn.classList.toggle("is-on", setRef.has(val));
+      updateLivePreview();
+    }
+
+    retailerBox?.addEventListener("click", function(e) {
+      const btn = e.target.closest("button");
+      if (!btn || !retailerBox.contains(btn)) return;
+      if (btn.dataset.welcomeOther) {
         draft.otherOn = !draft.otherOn;
-        otherBtn.classList.toggle("is-on", draft.otherOn);
-        if (!draft.otherOn) {{
+        btn.classList.toggle("is-on", draft.otherOn);
+        if (!draft.otherOn) {
           draft.otherStore = "";
           if (otherInput) otherInput.value = "";
-        }}
+        }
         syncOtherUi();
         updateLivePreview();
-      }});
-      retailerBox.appendChild(otherBtn);
-      syncOtherUi();
-    }}
+      } else if (btn.dataset.value !== undefined) {
+        toggleChip(btn, draft.retailers);
+      }
+    });
 
-    function renderChips(container, values, setRef) {{
-      if (!container) return;
-      container.innerHTML = "";
-      values.forEach(function(val) {{
-        const btn = document.createElement("button");
-        btn.type = "button";
-        btn.className = "sb-welcome-chip" + (setRef.has(val) ? " is-on" : "");
-        btn.textContent = titleize(val);
-        btn.addEventListener("click", function() {{
-          if (setRef.has(val)) setRef.delete(val);
-          else setRef.add(val);
-          btn.classList.toggle("is-on", setRef.has(val));
-          updateLivePreview();
-        }});
-        container.appendChild(btn);
-      }});
-    }}
-
-    function updateLivePreview() {{
+    categoryBox?.addEventListener("click", function(e) {
+      const btn = e.target.closest("button[data-value]");
+      if (btn && categoryBox.contains(btn)) toggleChip(btn, draft.categories);
+    });
+
+    function updateLivePreview() {
       selected.retailer = new Set(draft.retailers);
       selected.section.clear();
       selected.category = new Set(draft.categories);
       selected.brand.clear();
       const n = countMatchingCards();
-      syncAllCheckboxes();
-      updateBadges();
       applyFiltersAndSort();
       const other = getOtherStore();
-      if (previewStores) {{
+      if (previewStores) {
         let msg = draft.retailers.size
           ? (n + " deals match your stores")
           : "Nothing selected = all stores (" + n + " deals)";
         if (draft.otherOn && other) msg += " · noted: " + other;
         else if (draft.otherOn) msg += " · add your store below";
-        previewStores.textContent = msg;
-      }}
-      if (previewCategories) {{
-        previewCategories.textContent = draft.categories.size
+        setText(previewStores, msg);
+      }
+      if (previewCategories) {
+        setText(previewCategories, draft.categories.size
           ? (n + " deals in your pantry mix")
-          : "Nothing selected = all categories (" + n + " deals)";
-      }}
-    }}
+          : "Nothing selected = all categories (" + n + " deals)");
+      }
+    }
 
-    function setStep(next) {{
+    function setStep(next) {
       step = next;
-      steps.forEach(function(el) {{
+      steps.forEach(function(el) {
         el.classList.toggle("is-active", Number(el.dataset.step) === step);
-      }});
-      dots.forEach(function(dot) {{
+      });
+      dots.forEach(function(dot) {
         dot.classList.toggle("is-on", Number(dot.dataset.dot) <= step);
-      }});
-      if (step === 1) {{
+      });
+      if (step === 1) {
         renderRetailerChips();
         if (otherInput && draft.otherStore) otherInput.value = draft.otherStore;
         updateLivePreview();
-      }}
-      if (step === 2) {{
+      }
+      if (step === 2) {
         getOtherStore();
         renderChips(categoryBox, availableCategories(), draft.categories);
         updateLivePreview();
-      }}
-      if (step === 3) {{
+      }
+      if (step === 3) {
         wireWelcomeSignup();
-        window.setTimeout(function() {{
-          if (welcomeEmail) {{
-            welcomeEmail.focus({{ preventScroll: false }});
-            try {{
-              welcomeEmail.scrollIntoView({{ behavior: "smooth", block: "center" }});
-            }} catch (err) {{}}
-          }}
-        }}, 80);
-      }}
-    }}
-
-    if (otherInput) {{
-      otherInput.addEventListener("input", function() {{
+        window.setTimeout(function() {
+          if (welcomeEmail) {
+            welcomeEmail.focus({ preventScroll: false });
+            try {
+              welcomeEmail.scrollIntoView({ behavior: "smooth", block: "center" });
+            } catch (err) {}
+          }
+        }, 80);
+      }
+    }
+
+    if (otherInput) {
+      otherInput.addEventListener("input", function() {
         draft.otherStore = String(otherInput.value || "").trim();
         updateLivePreview();
-      }});
-    }}
+      });
+    }
 
-    function openWelcome() {{
+    function openWelcome() {
       // First paint: show the full (unfiltered) deals page behind the frost
       draft.retailers.clear();
       draft.categories.clear();
@@ -3930,20 +4217,17 @@ document.addEventListener("DOMContentLoaded", function () {{
       selected.section.clear();
       selected.category.clear();
       selected.brand.clear();
-      syncAllCheckboxes();
-      updateBadges();
       applyFiltersAndSort();
-      refreshFilterOptionLists();
 
       root.hidden = false;
       root.setAttribute("aria-hidden", "false");
       root.classList.add("open");
       document.body.classList.add("sb-welcome-lock");
       setStep(0);
-    }}
+    }
 
-    function closeWelcome(prefs) {{
-      const payload = Object.assign({{ completed: true }}, prefs || {{}});
+    function closeWelcome(prefs) {
+      const payload = Object.assign({ completed: true }, prefs || {});
       payload.retailers = Array.from(draft.retailers);
       payload.categories = Array.from(draft.categories);
       payload.otherStore = getOtherStore();
@@ -3953,222 +4237,488 @@ document.addEventListener("DOMContentLoaded", function () {{
       applyWelcomePrefs(payload);
       root.classList.remove("open");
       document.body.classList.remove("sb-welcome-lock");
-      window.setTimeout(function() {{
+      window.setTimeout(function() {
         root.hidden = true;
         root.setAttribute("aria-hidden", "true");
-      }}, 320);
-      try {{
+      }, 320);
+      try {
         const dealsList = document.getElementById("deals-list");
-        if (dealsList) dealsList.scrollIntoView({{ behavior: "smooth", block: "start" }});
-      }} catch (err) {{}}
-    }}
+        if (dealsList) dealsList.scrollIntoView({ behavior: "smooth", block: "start" });
+      } catch (err) {}
+    }
 
-    root.querySelectorAll("[data-welcome-next]").forEach(function(btn) {{
-      btn.addEventListener("click", function() {{
+    root.querySelectorAll("[data-welcome-next]").forEach(function(btn) {
+      btn.addEventListener("click", function() {
         if (step < 3) setStep(step + 1);
-        else closeWelcome({{}});
-      }});
-    }});
-    root.querySelectorAll("[data-welcome-back]").forEach(function(btn) {{
-      btn.addEventListener("click", function() {{
+        else closeWelcome({});
+      });
+    });
+    root.querySelectorAll("[data-welcome-back]").forEach(function(btn) {
+      btn.addEventListener("click", function() {
         if (step > 0) setStep(step - 1);
-      }});
-    }});
-    root.querySelectorAll("[data-welcome-skip]").forEach(function(btn) {{
-      btn.addEventListener("click", function() {{
-        if (step === 0) {{
+      });
+    });
+    root.querySelectorAll("[data-welcome-skip]").forEach(function(btn) {
+      btn.addEventListener("click", function() {
+        if (step === 0) {
           draft.retailers.clear();
           draft.categories.clear();
           draft.otherOn = false;
           draft.otherStore = "";
-          closeWelcome({{ skipped: true }});
-        }} else {{
-          closeWelcome({{}});
-        }}
-      }});
-    }});
+          closeWelcome({ skipped: true });
+        } else {
+          closeWelcome({});
+        }
+      });
+    });
 
     openWelcome();
-  }}
+  }
 
   initWelcomeFlow();
 
-  filterMasterBtn?.addEventListener("click", function() {{
+  filterMasterBtn?.addEventListener("click", function() {
     if (filterSheet?.classList.contains("open")) closeFilterSheet();
     else openFilterSheet();
-  }});
+  });
   filterSheetClose?.addEventListener("click", closeFilterSheet);
   filterSheetDone?.addEventListener("click", closeFilterSheet);
   filterSheetClear?.addEventListener("click", clearAllFilters);
   filterSheetBackdrop?.addEventListener("click", closeFilterSheet);
   filterDropdownBackdrop?.addEventListener("click", closeAllDropdowns);
 
-  filterScrollPrev?.addEventListener("click", function() {{
-    filterTrack.scrollBy({{ left: -180, behavior: "smooth" }});
-  }});
-  filterScrollNext?.addEventListener("click", function() {{
-    filterTrack.scrollBy({{ left: 180, behavior: "smooth" }});
-  }});
-  filterTrack?.addEventListener("scroll", function() {{
+  filterScrollPrev?.addEventListener("click", function() {
+    filterTrack.scrollBy({ left: -180, behavior: "smooth" });
+  });
+  filterScrollNext?.addEventListener("click", function() {
+    filterTrack.scrollBy({ left: 180, behavior: "smooth" });
+  });
+  filterTrack?.addEventListener("scroll", function() {
     updateScrollButtons();
-    if (openDropdownKey) {{
-      const btn = pillWraps[openDropdownKey]?.querySelector(".sb-filter-pill");
+    if (openDropdownKey) {
+      const btn = pillButtons[openDropdownKey];
       if (btn && filterDropdownPanel && !filterDropdownPanel.hidden) positionDropdownPanel(btn);
-    }}
-  }});
-  window.addEventListener("resize", function() {{
+    }
+  });
+  window.addEventListener("resize", function() {
     updateScrollButtons();
-    if (openDropdownKey) {{
-      const btn = pillWraps[openDropdownKey]?.querySelector(".sb-filter-pill");
+    if (openDropdownKey) {
+      const btn = pillButtons[openDropdownKey];
       if (btn && filterDropdownPanel && !filterDropdownPanel.hidden) positionDropdownPanel(btn);
-    }}
-  }});
+    }
+  });
   updateScrollButtons();
 
-  document.addEventListener("keydown", function(ev) {{
-    if (ev.key === "Escape") {{
+  document.addEventListener("keydown", function(ev) {
+    if (ev.key === "Escape") {
       closeAllDropdowns();
       closeFilterSheet();
-    }}
-  }});
+    }
+  });
   /* ============================
      CARD IMAGE CAROUSEL (per flavor)
      ============================ */
-  function initCardCarousels(root) {{
-    const scope = root || document;
-    scope.querySelectorAll(".card-carousel").forEach(function(carousel) {{
-      if (carousel.dataset.carouselReady === "1") return;
-      const slides = Array.from(carousel.querySelectorAll(".card-carousel-slide"));
-      if (!slides.length) return;
-
-      carousel.dataset.carouselReady = "1";
-
-      let index = 0;
-      const caption = carousel.querySelector(".card-carousel-caption");
-      const stage = carousel.querySelector(".card-carousel-stage");
-
-      function updateCaption() {{
-        if (!caption) return;
-        const name = slides[index].getAttribute("data-flavor-name") || "";
-        caption.textContent = name;
-        caption.hidden = !name;
-      }}
-
-      if (slides.length === 1) {{
-        slides[0].classList.add("is-active");
-        updateCaption();
-        return;
-      }}
-
-      const prevBtn = carousel.querySelector(".card-carousel-prev");
-      const nextBtn = carousel.querySelector(".card-carousel-next");
-
-      function render() {{
-        const n = slides.length;
-        slides.forEach(function(slide, i) {{
-          slide.classList.remove("is-active", "is-prev", "is-next", "is-hidden");
-          if (i === index) {{
-            slide.classList.add("is-active");
-          }} else if (i === (index - 1 + n) % n) {{
-            slide.classList.add("is-prev");
-          }} else if (i === (index + 1) % n) {{
-            slide.classList.add("is-next");
-          }} else {{
-            slide.classList.add("is-hidden");
-          }}
-        }});
-        updateCaption();
-      }}
-
-      function goPrev() {{
-        index = (index - 1 + slides.length) % slides.length;
-        render();
-      }}
-
-      function goNext() {{
-        index = (index + 1) % slides.length;
-        render();
-      }}
-
-      prevBtn?.addEventListener("click", function(e) {{
-        e.preventDefault();
-        e.stopPropagation();
-        goPrev();
-      }});
-
-      nextBtn?.addEventListener("click", function(e) {{
-        e.preventDefault();
-        e.stopPropagation();
-        goNext();
-      }});
-
-      if (stage) {{
-        let touchStartX = 0;
-        let touchStartY = 0;
-        stage.addEventListener("touchstart", function(e) {{
-          if (!e.changedTouches.length) return;
-          touchStartX = e.changedTouches[0].screenX;
-          touchStartY = e.changedTouches[0].screenY;
-        }}, {{ passive: true }});
-        stage.addEventListener("touchend", function(e) {{
-          if (!e.changedTouches.length) return;
-          const dx = e.changedTouches[0].screenX - touchStartX;
-          const dy = e.changedTouches[0].screenY - touchStartY;
-          if (Math.abs(dx) < 36 || Math.abs(dx) < Math.abs(dy)) return;
-          if (dx < 0) goNext();
-          else goPrev();
-        }}, {{ passive: true }});
-      }}
+  /* Slides between "next" and "previous" come as data (see write_page) and
+     are parsed in one insert, just ahead of the last slide, when the
+     carousel is wired. */
+  const DEFERRED_SLIDES = window.__SB_SLIDES || {};
+  let cardIndexes = null;
+
+  function insertDeferredSlides(carousel) {
+    if (!cardIndexes) {
+      cardIndexes = new Map();
+      cards.forEach(function(card, i) { cardIndexes.set(card, i); });
+    }
+    const items = DEFERRED_SLIDES[cardIndexes.get(carousel.closest(".card"))];
+    const stage = carousel.querySelector(".card-carousel-stage");
+    const last = stage && stage.lastElementChild;
+    if (!items || !last) return;
+    const html = items.map(function(item, k) {
+      return '<div class="card-carousel-slide is-hidden" data-index="' + (k + 2)
+        + '" data-flavor-name="' + escapeHtml(item[2]) + '"><a href="' + escapeHtml(item[0])
+        + '" target="_blank" rel="noopener noreferrer" class="card-carousel-link"><img src="'
+        + escapeHtml(item[1]) + '" alt="' + escapeHtml(item[3]) + '" class="card-image" width="${card_image_width}"'
+        + ' height="${card_image_height}" loading="lazy" decoding="async"/></a></div>';
+    }).join("");
+    last.insertAdjacentHTML("beforebegin", html);
+  }
+
+  function initCarousel(carousel) {
+    if (carousel.dataset.carouselReady === "1") return;
+    if (carousel.hasAttribute("data-deferred-slides")) insertDeferredSlides(carousel);
+    const slides = Array.from(carousel.querySelectorAll(".card-carousel-slide"));
+    if (!slides.length) return;
+
+    carousel.dataset.carouselReady = "1";
+
+    let index = 0;
+    const caption = carousel.querySelector(".card-carousel-caption");
+    const stage = carousel.querySelector(".card-carousel-stage");
+
+    function updateCaption() {
+      if (!caption) return;
+      const name = slides[index].getAttribute("data-flavor-name") || "";
+      caption.textContent = name;
+      caption.hidden = !name;
+    }
+
+    if (slides.length === 1) {
+      slides[0].classList.add("is-active");
+      updateCaption();
+      return;
+    }
+
+    const prevBtn = carousel.querySelector(".card-carousel-prev");
+    const nextBtn = carousel.querySelector(".card-carousel-next");
+
+    function render() {
+      const n = slides.length;
+      slides.forEach(function(slide, i) {
+        slide.classList.remove("is-active", "is-prev", "is-next", "is-hidden");
+        if (i === index) {
+          slide.classList.add("is-active");
+        } else if (i === (index - 1 + n) % n) {
+          slide.classList.add("is-prev");
+        } else if (i === (index + 1) % n) {
+          slide.classList.add("is-next");
+        } else {
+          slide.classList.add("is-hidden");
+        }
+      });
+      updateCaption();
+    }
+
+    function goPrev() {
+      index = (index - 1 + slides.length) % slides.length;
+      render();
+    }
 
+    function goNext() {
+      index = (index + 1) % slides.length;
       render();
-    }});
-  }}
+    }
+
+    prevBtn?.addEventListener("click", function(e) {
+      e.preventDefault();
+      e.stopPropagation();
+      goPrev();
+    });
+
+    nextBtn?.addEventListener("click", function(e) {
+      e.preventDefault();
+      e.stopPropagation();
+      goNext();
+    });
+
+    if (stage) {
+      let touchStartX = 0;
+      let touchStartY = 0;
+      stage.addEventListener("touchstart", function(e) {
+        if (!e.changedTouches.length) return;
+        touchStartX = e.changedTouches[0].screenX;
+        touchStartY = e.changedTouches[0].screenY;
+      }, { passive: true });
+      stage.addEventListener("touchend", function(e) {
+        if (!e.changedTouches.length) return;
+        const dx = e.changedTouches[0].screenX - touchStartX;
+        const dy = e.changedTouches[0].screenY - touchStartY;
+        if (Math.abs(dx) < 36 || Math.abs(dx) < Math.abs(dy)) return;
+        if (dx < 0) goNext();
+        else goPrev();
+      }, { passive: true });
+    }
+
+    render();
+  }
+
+  /* Slides arrive with their starting classes from the generator, so a
+     carousel only needs wiring once it nears the viewport. Cards hidden by
+     a filter are never wired until they are shown and scrolled to. */
+  const carouselObserver = typeof IntersectionObserver === "function"
+    ? new IntersectionObserver(function(entries, observer) {
+        entries.forEach(function(entry) {
+          if (!entry.isIntersecting) return;
+          observer.unobserve(entry.target);
+          initCarousel(entry.target);
+        });
+      }, { rootMargin: "400px 0px" })
+    : null;
+
+  function initCardCarousels(root) {
+    const scope = root || document;
+    scope.querySelectorAll(".card-carousel").forEach(function(carousel) {
+      if (carouselObserver) carouselObserver.observe(carousel);
+      else initCarousel(carousel);
+    });
+  }
 
   initCardCarousels(document);
 
   /* ============================
      FLAVOR EXPAND/COLLAPSE
      ============================ */
-  const flavorExpandLinks = document.querySelectorAll(".flavor-expand-link");
-  flavorExpandLinks.forEach(function(link) {{
-    link.addEventListener("click", function() {{
-      const cardId = this.getAttribute("data-card-id");
-      const expandedList = document.getElementById("flavors-" + cardId);
-      if (!expandedList) return;
-
-      const isExpanded = this.getAttribute("aria-expanded") === "true";
-      
-      if (isExpanded) {{
-        // Collapse
-        expandedList.style.display = "none";
-        this.setAttribute("aria-expanded", "false");
-        const n = this.getAttribute("data-extra-count");
-        if (n) {{
-          this.textContent = n + " more flavors";
-        }}
-      }} else {{
-        // Expand
-        expandedList.style.display = "flex";
-        this.setAttribute("aria-expanded", "true");
-        this.textContent = "Show less";
-      }}
-    }});
-  }});
-}});
+  /* One delegated listener on the grid instead of one per card */
+  grid?.addEventListener("click", function(e) {
+    const link = e.target.closest(".flavor-expand-link");
+    if (!link) return;
+    const cardId = link.getAttribute("data-card-id");
+    const expandedList = document.getElementById("flavors-" + cardId);
+    if (!expandedList) return;
+
+    const isExpanded = link.getAttribute("aria-expanded") === "true";
+
+    if (isExpanded) {
+      // Collapse
+      expandedList.style.display = "none";
+      link.setAttribute("aria-expanded", "false");
+      /* Count comes from the generator; the label matches the server-rendered one */
+      const n = +link.dataset.extraCount;
+      if (n) {
+        link.textContent = n + " more flavor" + (n === 1 ? "" : "s");
+      }
+    } else {
+      // Expand
+      expandedList.style.display = "flex";
+      link.setAttribute("aria-expanded", "true");
+      link.textContent = "Show less";
+    }
+  });
+});
 </script>
 
 </body>
 </html>
+    """)
+
+
+_BEEHIIV_FORM_ATTR = html.escape(BEEHIIV_FORM_ID)
+
+# Slots whose values are fixed for the life of the process (script + environment)
+_STATIC_FIELDS = {
+    "critical_css": CRITICAL_CSS_MIN,
+    "stylesheet_href": STYLESHEET_HREF,
+    "beehiiv_embed_script": (
+        f'<script async src="https://subscribe-forms.beehiiv.com/v3/loader.js" '
+        f'data-beehiiv-form="{_BEEHIIV_FORM_ATTR}"></script>'
+        if BEEHIIV_FORM_ID
+        else '<p class="sb-note">Email signup is almost ready.</p>'
+    ),
+    "beehiiv_form_id": _BEEHIIV_FORM_ATTR,
+    "beehiiv_pub_id": html.escape(BEEHIIV_PUBLICATION_ID),
+    "card_image_width": str(CARD_IMAGE_WIDTH),
+    "card_image_height": str(CARD_IMAGE_HEIGHT),
+}
+
+
+def compile_page_template(template: string.Template, static) -> list:
+    """
+    Pre-render *template* with the *static* fields into a list of UTF-8 byte
+    runs interleaved with the names of the slots left to fill per build, so
+    write_page never rescans the template for placeholders.
+    """
+    text = template.template
+    parts = []
+    run = []
+    pos = 0
+    for m in template.pattern.finditer(text):
+        run.append(text[pos:m.start()])
+        pos = m.end()
+        name = m.group("named") or m.group("braced")
+        if m.group("escaped") is not None:
+            run.append(template.delimiter)
+        elif name in static:
+            run.append(static[name])
+        elif name:
+            parts.append("".join(run).encode("utf-8"))
+            parts.append(name)
+            run = []
+        else:
+            raise ValueError(f"Invalid placeholder in page template at offset {m.start()}")
+    run.append(text[pos:])
+    parts.append("".join(run).encode("utf-8"))
+    return parts
+
+
+_PAGE_PARTS = compile_page_template(PAGE_TEMPLATE, _STATIC_FIELDS)
+
+
+def build_filter_css(facets) -> str:
+    """
+    One hide rule per filter value, matched on the value's index (the code
+    cards carry in data-<key>). The client puts x-<key>-<i> on the grid for
+    every value of <key> that is *not* selected, so filtering a whole key is
+    a single className write instead of a style change per card.
+    """
+    return "".join(
+        f'.card-grid.x-{key}-{i} .card[data-{key}="{i}"]{{display:none}}'
+        for key, values in facets.items()
+        for i in range(len(values))
+    )
+
+
+def _js_number(value) -> str:
+    """JS literal for a float sort key; non-finite values sort as 0."""
+    return repr(value) if math.isfinite(value) else "0"
+
+
+def build_page_data_script(deals_sorted, facets, image_items, card_names) -> str:
+    """
+    Inline data for the client script: the sorted value list of each filter
+    key, plus typed arrays of each card's price, percent off and tier
+    priority, indexed by each card's position in the page. The cards only
+    carry the filter codes their CSS hide rules match on. __SB_SLIDES holds
+    the carousel slides left out of the markup, keyed by card position;
+    *image_items* and *card_names* are each card's carousel items and cleaned
+    product name, in the same order as *deals_sorted*.
+    """
+    # "</" would end the inline <script> early
+    facets_json = json.dumps(facets, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+    prices = ",".join(_js_number(d.get("new_price") or 0.0) for d in deals_sorted)
+    pcts = ",".join(_js_number(d.get("percent_off") or 0.0) for d in deals_sorted)
+    tiers = ",".join(str(-d["_sortkey"][0]) for d in deals_sorted)
+    slides = {}
+    for i, (items, name) in enumerate(zip(image_items, card_names)):
+        deferred = deferred_carousel_slides(items, name)
+        if deferred:
+            slides[i] = deferred
+    slides_json = json.dumps(slides, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+    return (
+        "<script>\n"
+        f"window.__SB_FACETS = {facets_json};\n"
+        f"window.__SB_SLIDES = {slides_json};\n"
+        f"window.__SB_PRICES = new Float64Array([{prices}]);\n"
+        f"window.__SB_PCT = new Float64Array([{pcts}]);\n"
+        f"window.__SB_TIER = new Uint8Array([{tiers}]);\n"
+        "</script>"
+    )
+
+
+def write_page(deals, out) -> None:
+    """Render the page into the binary stream *out*, one card at a time."""
+    # Group deals into deal families
+    grouped_deals = group_deals(deals)
+    # Calculate total number of individual deals (flavors) across all groups
+    total_deals = sum(
+        len(g.get("flavor_data", [])) if g.get("flavor_data") else 1
+        for g in grouped_deals
+    )
+    last_updated = get_last_updated_text(deals)
+
+    # Sort: tier (diamond first, then fire, then strong, then sale) → best savings → price
+    deals_sorted = sorted(grouped_deals, key=itemgetter("_sortkey"))
+    retailer_lowers = [retailer_lower(d) for d in deals_sorted]
+    filter_values = list(map(card_filter_values, deals_sorted, retailer_lowers))
+    facets = {
+        key: sorted(set(column))
+        for key, column in zip(FILTER_KEYS, zip(*filter_values))
+    } if filter_values else {}
+    codes = {key: {v: i for i, v in enumerate(values)} for key, values in facets.items()}
+    filter_codes = [
+        tuple(codes[key][v] for key, v in zip(FILTER_KEYS, values))
+        for values in filter_values
+    ]
+    # Shared by the cards and the page data, so each is worked out once per card
+    image_items = [get_card_image_items(d) for d in deals_sorted]
+    card_names = [remove_pack_size_from_name(d.get("product_name", "")) for d in deals_sorted]
+    fields = {
+        "filter_css": build_filter_css(facets),
+        "page_data_script": build_page_data_script(deals_sorted, facets, image_items, card_names),
+        "last_updated": last_updated,
+    }
+
+    for part in _PAGE_PARTS:
+        if isinstance(part, bytes):
+            out.write(part)
+        elif part == "cards_html":
+            # Each card ends with a newline, so no separators are needed between them
+            cards = map(
+                build_card_html,
+                deals_sorted,
+                filter_values,
+                filter_codes,
+                image_items,
+                card_names,
+                retailer_lowers,
+            )
+            out.writelines(card.encode("utf-8") for card in cards)
+        else:
+            out.write(fields[part].encode("utf-8"))
+
+
+def write_page_file(deals, path: Path = OUTPUT_PATH) -> None:
+    """
+    Stream the page into a temp file beside *path* and move it over *path*
+    only once it is complete, so a failed render never leaves the live page
+    half-written.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with tmp.open("wb") as out:
+            write_page(deals, out)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def write_stylesheet(path: Path = STYLESHEET_PATH) -> bool:
+    """Write the minified PAGE_CSS to *path* unless it already holds the same bytes."""
+    data = PAGE_CSS_MIN.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+def build_page_html(deals):
+    buf = io.BytesIO()
+    write_page(deals, buf)
+    return buf.getvalue().decode("utf-8")
+
+
+def build_cache_key(raw: bytes) -> str:
     """
+    Digest of everything the output depends on: the deals file as read, this
+    script (template, CSS, JS) and the Beehiiv ids from the environment.
+    """
+    h = hashlib.blake2b(raw, digest_size=16)
+    h.update(Path(__file__).read_bytes())
+    h.update(f"{BEEHIIV_FORM_ID}\0{BEEHIIV_PUBLICATION_ID}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def is_build_current(key: str) -> bool:
+    """True when the last build used the same inputs and its output is still there."""
+    try:
+        cached = BUILD_CACHE_PATH.read_text(encoding="utf-8").strip()
+    except OSError:
+        return False
+    return cached == key and OUTPUT_PATH.exists() and STYLESHEET_PATH.exists()
+
+
 def main():
-    deals = load_deals()
-    page_html = build_page_html(deals)
+    raw = read_deals_bytes()
+    cache_key = build_cache_key(raw)
+    if is_build_current(cache_key):
+        print("UNCHANGED:", OUTPUT_PATH.resolve(), "(inputs match the last build, skipped)")
+        return
+    # Drop the old key first: it is only written back once both outputs are
+    # fully in place, so an interrupted or failed build is never "current"
+    BUILD_CACHE_PATH.unlink(missing_ok=True)
+    deals = load_deals(raw)
 
     DOCS_DIR.mkdir(parents=True, exist_ok=True)
-    OUTPUT_PATH.write_text(page_html, encoding="utf-8")
+    write_page_file(deals, OUTPUT_PATH)
+    css_written = write_stylesheet(STYLESHEET_PATH)
+    BUILD_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    BUILD_CACHE_PATH.write_text(cache_key, encoding="utf-8")
     print("SCRIPT FILE:", Path(__file__).resolve())
     print("OUTPUT PATH:", OUTPUT_PATH.resolve())
     print("WROTE:", OUTPUT_PATH.resolve())
+    print("STYLES:", STYLESHEET_PATH.resolve(), "(updated)" if css_written else "(unchanged)")
     print("DEALS:", len(deals))
     form_id = BEEHIIV_FORM_ID
     if form_id:
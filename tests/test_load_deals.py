@@ -0,0 +1,33 @@
+import io
+import math
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import generate_deals_page as gdp  # noqa: E402
+
+
+# build_deals_json_from_csv.py writes NaN for a blank price cell
+NAN_PRICE_DEALS = b"""[
+  {"product_name": "Barebells Protein Bar Cookies & Cream", "retailer": "Kroger",
+   "new_price": NaN, "old_price": 2.99, "percent_off": 10.0,
+   "category": "Bars", "section": "protein", "retailer_url": "https://example.com/p"}
+]"""
+
+
+class LoadDealsTest(unittest.TestCase):
+    def test_nan_price_is_accepted(self):
+        deals = gdp.load_deals(NAN_PRICE_DEALS)
+        self.assertEqual(len(deals), 1)
+        self.assertTrue(math.isnan(deals[0]["new_price"]))
+
+    def test_nan_price_page_still_builds(self):
+        out = io.BytesIO()
+        gdp.write_page(gdp.load_deals(NAN_PRICE_DEALS), out)
+        self.assertIn(b"Barebells", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()